@@ -9,14 +9,26 @@ Loads and validates configuration from:
 
 import os
 import re
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings
 
 
+# libyaml-backed loader when available (same semantics as SafeLoader, ~2-3x faster)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# ${VAR_NAME} references substituted from the environment
+_ENV_VAR_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+
+def _env_var_value(match: "re.Match[str]") -> str:
+    return os.getenv(match.group(1), "")
+
+
 # ============================================================
 # Configuration Models
 # ============================================================
@@ -30,6 +42,7 @@ class AppConfig(BaseModel):
     debug: bool = True
     reload: bool = True
     timezone: str = "UTC"
+    cache_fallback_enabled: bool = True  # Serve stale cached reads when the backend fails
 
 
 class DatabaseConfig(BaseModel):
@@ -41,11 +54,15 @@ class DatabaseConfig(BaseModel):
     password: str
     pool_size: int = 20
     max_overflow: int = 10
+    pool_recycle: int = 1800
+    pool_timeout: int = 30
+    statement_cache_size: int = 256
+    command_timeout: int = 30
     echo: bool = False
     
-    @property
+    @cached_property
     def url(self) -> str:
-        """Generate async PostgreSQL URL."""
+        """Generate async PostgreSQL URL (built once per config instance)."""
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
 
@@ -109,6 +126,34 @@ class MCPConfig(BaseModel):
     mcps: List[MCPServerConfig] = Field(default_factory=list)
 
 
+class UserEntryConfig(BaseModel):
+    """A user or super admin entry in users.yaml."""
+    email: str
+    name: Optional[str] = None
+    role: Optional[str] = None
+    teams: List[str] = Field(default_factory=list)
+    allowed_mcps: Union[str, List[str], Dict[str, Any]] = Field(default_factory=list)
+    allowed_domains: Union[str, List[str]] = Field(default_factory=list)
+    allowed_databases: Union[str, List[str]] = Field(default_factory=list)
+    slack_user_id: Optional[str] = None
+    
+    model_config = {"extra": "allow"}  # description, is_super_admin, etc.
+
+
+class UsersConfig(BaseModel):
+    """
+    Shape check for users.yaml.
+    
+    Only used to validate the file at load time; callers keep reading the
+    plain dict (settings.users_config).
+    """
+    default_user: Dict[str, Any] = Field(default_factory=dict)
+    super_admins: List[UserEntryConfig] = Field(default_factory=list)
+    users: List[UserEntryConfig] = Field(default_factory=list)
+    
+    model_config = {"extra": "allow"}  # roles, teams, session, etc.
+
+
 class SecurityConfig(BaseModel):
     """Security settings."""
     secret_key: str
@@ -158,6 +203,7 @@ class Settings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
     APP_RELOAD: bool = True
+    APP_CACHE_FALLBACK_ENABLED: bool = True
     
     # Database
     DATABASE_HOST: str = "localhost"
@@ -167,6 +213,10 @@ class Settings(BaseSettings):
     DATABASE_PASSWORD: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_STATEMENT_CACHE_SIZE: int = 256
+    DATABASE_COMMAND_TIMEOUT: int = 30
     
     # Anthropic
     ANTHROPIC_API_KEY: str
@@ -195,7 +245,7 @@ class ConfigLoader:
     
     def __init__(self, config_dir: Path = Path("config")):
         self.config_dir = config_dir
-        self._cache: Dict[str, Any] = {}
+        self._cache: Dict[str, Tuple[int, Any]] = {}
     
     def _substitute_env_vars(self, data: Any) -> Any:
         """
@@ -208,33 +258,40 @@ class ConfigLoader:
         elif isinstance(data, list):
             return [self._substitute_env_vars(item) for item in data]
         elif isinstance(data, str):
-            # Find ${VAR_NAME} patterns
-            pattern = r'\$\{([^}]+)\}'
-            matches = re.findall(pattern, data)
-            
-            result = data
-            for var_name in matches:
-                env_value = os.getenv(var_name, "")
-                result = result.replace(f"${{{var_name}}}", env_value)
-            
-            return result
+            # Most strings carry no references; skip the regex for those
+            if "${" not in data:
+                return data
+            # Replace ${VAR_NAME} patterns in a single pass
+            return _ENV_VAR_PATTERN.sub(_env_var_value, data)
         else:
             return data
     
     def load_yaml(self, filename: str) -> Dict[str, Any]:
-        """Load and parse a YAML configuration file."""
-        filepath = self.config_dir / filename
+        """
+        Load and parse a YAML configuration file.
         
-        if not filepath.exists():
-            raise FileNotFoundError(f"Configuration file not found: {filepath}")
+        Parsed documents are cached per path along with the file's mtime, so
+        repeated loads of an unchanged file skip the parse. Editing the file
+        invalidates the entry.
+        """
+        filepath = self.config_dir / filename
         
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        try:
+            mtime_ns = filepath.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {filepath}") from None
         
-        # Substitute environment variables
-        data = self._substitute_env_vars(data)
+        cached = self._cache.get(str(filepath))
+        if cached and cached[0] == mtime_ns:
+            data = cached[1]
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
+            self._cache[str(filepath)] = (mtime_ns, data)
         
-        return data
+        # Substitute environment variables (builds new containers, so the
+        # cached document is never handed out or mutated by callers)
+        return self._substitute_env_vars(data)
     
     def load_settings_yaml(self) -> Dict[str, Any]:
         """Load settings.yaml."""
@@ -250,8 +307,15 @@ class ConfigLoader:
         )
     
     def load_users_yaml(self) -> Dict[str, Any]:
-        """Load users.yaml."""
-        return self.load_yaml("users.yaml")
+        """
+        Load users.yaml.
+        
+        The document is validated against UsersConfig so a malformed entry
+        fails at startup instead of on the first lookup that touches it.
+        """
+        data = self.load_yaml("users.yaml") or {}
+        UsersConfig.model_validate(data)
+        return data
     
     def load_slack_yaml(self) -> Dict[str, Any]:
         """Load slack.yaml."""
@@ -280,6 +344,7 @@ class GlobalConfig:
             port=settings_env.APP_PORT,
             debug=settings_env.APP_DEBUG,
             reload=settings_env.APP_RELOAD,
+            cache_fallback_enabled=settings_env.APP_CACHE_FALLBACK_ENABLED,
         )
         
         # Database config
@@ -291,6 +356,10 @@ class GlobalConfig:
             password=settings_env.DATABASE_PASSWORD,
             pool_size=settings_env.DATABASE_POOL_SIZE,
             max_overflow=settings_env.DATABASE_MAX_OVERFLOW,
+            pool_recycle=settings_env.DATABASE_POOL_RECYCLE,
+            pool_timeout=settings_env.DATABASE_POOL_TIMEOUT,
+            statement_cache_size=settings_env.DATABASE_STATEMENT_CACHE_SIZE,
+            command_timeout=settings_env.DATABASE_COMMAND_TIMEOUT,
         )
         
         # LLM config
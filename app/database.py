@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 from app.utils.logger import logger
@@ -62,11 +63,23 @@ async def init_db() -> None:
         engine = create_async_engine(
             settings.database.url,
             echo=settings.database.echo,
+            poolclass=AsyncAdaptedQueuePool,
             pool_size=settings.database.pool_size,
             max_overflow=settings.database.max_overflow,
+            # Seconds to wait for a free connection before failing the request
+            pool_timeout=settings.database.pool_timeout,
+            # Hand out the most recently returned connection, so idle
+            # surplus connections sit unused until recycled instead of
+            # being kept warm round-robin
+            pool_use_lifo=True,
             pool_pre_ping=True,  # Verify connections before using
-            pool_recycle=3600,   # Recycle connections after 1 hour
-            connect_args={"ssl": False},  # Disable SSL for local development
+            pool_recycle=settings.database.pool_recycle,
+            connect_args={
+                "ssl": False,  # Disable SSL for local development
+                # Keep frequently used statements prepared per connection
+                "prepared_statement_cache_size": settings.database.statement_cache_size,
+                "command_timeout": settings.database.command_timeout,
+            },
         )
         
         # Create session factory
@@ -94,6 +107,21 @@ async def init_db() -> None:
         raise
 
 
+def require_engine() -> AsyncEngine:
+    """
+    Return the engine created by init_db().
+    
+    The engine and its pool are owned by the application lifespan; callers
+    never connect on their own, so a missing engine means startup did not run.
+    
+    Raises:
+        RuntimeError: If init_db() has not been called
+    """
+    if engine is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    return engine
+
+
 async def close_db() -> None:
     """
     Close database connections.
@@ -125,6 +153,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     if AsyncSessionLocal is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
     
+    # The context manager closes the session (returning its connection to the pool)
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -132,8 +161,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 # ============================================================
@@ -188,9 +215,8 @@ async def execute_raw_sql(sql: str) -> list:
     Returns:
         List of row dictionaries
     """
-    if engine is None:
-        raise RuntimeError("Database not initialized")
-    
-    async with engine.begin() as conn:
+    async with require_engine().begin() as conn:
         result = await conn.execute(text(sql))
-        return [dict(row) for row in result.mappings()]
+        # Resolve column names once instead of building a mapping per row
+        keys = tuple(result.keys())
+        return [dict(zip(keys, row)) for row in result]
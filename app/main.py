@@ -6,23 +6,30 @@ configures middleware, registers routers, and sets up startup/shutdown events.
 """
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from datetime import datetime, timezone
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+import orjson
 
 from app import __version__
 from app.config import settings
 from app.database import init_db, close_db, get_db
 from app.routers import health
-from app.utils.logger import setup_logging, logger
+from app.routers.users import warm_users_cache
+from app.utils.logger import setup_logging, stop_logging, logger
+from app.utils.responses import ORJSONResponse
 from app.services.mcp_registry import get_mcp_registry
+from app.services.mcp_client import get_mcp_client
+from app.services.audit_service import get_audit_service
+from app.services.cache_invalidation import listen_cache_invalidations
 from app.models import Omni2Config
 from sqlalchemy import select
-import asyncio
-
-
+from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
 
 
@@ -30,24 +37,44 @@ import asyncio
 # Background Tasks
 # ============================================================
 
+# omni2_config values read by the background loops. All keys are loaded in
+# one query and shared by both loops, refreshed at most once per TTL.
+LOOP_CONFIG_TTL = 60
+_loop_config_cache: Dict[str, Any] = {"data": {}, "timestamp": None}
+
+
+async def _get_loop_config(db: AsyncSession, key: str) -> Dict[str, Any]:
+    """Get an omni2_config value for a background loop ({} if not set)."""
+    now = time.monotonic()
+    cached_at = _loop_config_cache["timestamp"]
+    if cached_at is None or now - cached_at >= LOOP_CONFIG_TTL:
+        result = await db.execute(select(Omni2Config.config_key, Omni2Config.config_value))
+        _loop_config_cache["data"] = dict(result.all())
+        _loop_config_cache["timestamp"] = now
+    return _loop_config_cache["data"].get(key) or {}
+
+
 async def health_check_loop():
     """Background task for proactive health monitoring."""
     interval = 60  # Default interval
+    rollup_refreshed_for = None  # UTC day the audit rollup was last refreshed
     
     while True:
         try:
+            # The audit stats rollup only holds complete days: refresh once per UTC day
+            today = datetime.now(timezone.utc).date()
+            if rollup_refreshed_for != today:
+                if await get_audit_service().refresh_daily_rollup():
+                    rollup_refreshed_for = today
+            
             async for db in get_db():
                 # Load config
-                result = await db.execute(
-                    select(Omni2Config).where(Omni2Config.config_key == 'health_check')
-                )
-                config = result.scalar_one_or_none()
-                interval = config.config_value.get('interval_seconds', 60) if config else 60
+                config = await _get_loop_config(db, 'health_check')
+                interval = config.get('interval_seconds', 60)
                 
-                # Check health of all MCPs
+                # Check health of all MCPs (probes run concurrently)
                 mcp_registry = get_mcp_registry()
-                for mcp_name in mcp_registry.get_loaded_mcps():
-                    await mcp_registry.health_check(mcp_name, db)
+                await mcp_registry.health_check_all(db)
                 
                 break
             
@@ -65,11 +92,8 @@ async def hot_reload_loop():
         try:
             async for db in get_db():
                 # Load config
-                result = await db.execute(
-                    select(Omni2Config).where(Omni2Config.config_key == 'hot_reload')
-                )
-                config = result.scalar_one_or_none()
-                interval = config.config_value.get('interval_seconds', 30) if config else 30
+                config = await _get_loop_config(db, 'hot_reload')
+                interval = config.get('interval_seconds', 30)
                 
                 # Reload if changed
                 mcp_registry = get_mcp_registry()
@@ -83,10 +107,61 @@ async def hot_reload_loop():
             await asyncio.sleep(interval)  # Use last known interval instead of hardcoded 30
 
 
+async def warm_mcp_client() -> None:
+    """
+    Connect the chat MCP client to every enabled server (concurrently).
+    
+    Runs in the background, so the first request doesn't pay for the
+    handshakes and tool discovery while startup never waits on MCP
+    reachability. Unreachable servers are logged and retried on demand.
+    """
+    logger.info("🔌 Pre-warming MCP client connections...")
+    try:
+        warmup = await get_mcp_client().list_tools()
+    except Exception as e:
+        logger.warning("MCP client warm-up failed", error=str(e))
+        return
+    logger.info(
+        "✅ MCP client connections warmed",
+        servers=len(warmup["servers"]),
+        total_tools=warmup["total_tools"],
+    )
+
+
 # ============================================================
 # Application Lifespan
 # ============================================================
 
+@asynccontextmanager
+async def background_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """
+    Run the background loops for the lifetime of the application.
+    
+    Task handles are kept here (the event loop only holds weak references),
+    and the loops are cancelled and awaited on exit so shutdown never
+    races a loop that is still using the database or MCP clients.
+    """
+    logger.info("🔄 Starting background tasks...")
+    tasks = [
+        asyncio.create_task(health_check_loop(), name="health_check_loop"),
+        asyncio.create_task(hot_reload_loop(), name="hot_reload_loop"),
+        # Applies /users and permission cache invalidations from other workers
+        asyncio.create_task(listen_cache_invalidations(), name="listen_cache_invalidations"),
+        # One-shot: first chat requests skip the MCP handshakes
+        asyncio.create_task(warm_mcp_client(), name="warm_mcp_client"),
+        # One-shot: first requests per known user skip the cold lookup
+        asyncio.create_task(warm_users_cache(), name="warm_users_cache"),
+    ]
+    logger.info("✅ Background tasks started")
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("✅ Background tasks stopped")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
@@ -97,32 +172,41 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     - Configuration loading
     - Resource cleanup on shutdown
     """
-    # Startup
-    logger.info("=" * 80)
-    logger.info("🚀 OMNI2 Bridge Application - Starting Up")
-    logger.info("=" * 80)
-    logger.info(f"📦 Version: {__version__}")
-    logger.info(f"🌍 Environment: {settings.app.environment}")
-    logger.info(f"🐛 Debug Mode: {settings.app.debug}")
-    logger.info(f"🔄 Auto-Reload: {settings.app.reload}")
-    logger.info(f"🌐 Host: {settings.app.host}:{settings.app.port}")
-    logger.info("-" * 80)
-    logger.info("🤖 Anthropic Claude Configuration:")
-    logger.info(f"   Model: {settings.llm.model}")
-    logger.info(f"   Max Tokens: {settings.llm.max_tokens}")
-    logger.info(f"   Timeout: {settings.llm.timeout}s")
-    logger.info(f"   API Key: {'✅ Configured' if settings.llm.api_key else '❌ Missing'}")
-    logger.info("-" * 80)
-    logger.info("🗄️  Database Configuration:")
-    logger.info(f"   Host: {settings.database.host}:{settings.database.port}")
-    logger.info(f"   Database: {settings.database.database}")
-    logger.info(f"   User: {settings.database.user}")
-    logger.info(f"   Pool Size: {settings.database.pool_size} (max overflow: {settings.database.max_overflow})")
-    logger.info("-" * 80)
-    logger.info("🔐 Security:")
-    logger.info(f"   CORS Enabled: {settings.security.cors_enabled}")
-    logger.info(f"   Secret Key: {'✅ Configured' if settings.security.secret_key != 'change-this-in-production' else '⚠️  Using Default (Change in Production!)'}")
-    logger.info("-" * 80)
+    # Startup banner: built and written as one record, and only when INFO is on
+    if logger.is_enabled_for(logging.INFO):
+        llm_key_status = '✅ Configured' if settings.llm.api_key else '❌ Missing'
+        secret_key_status = (
+            '✅ Configured'
+            if settings.security.secret_key != 'change-this-in-production'
+            else '⚠️  Using Default (Change in Production!)'
+        )
+        logger.info("\n".join([
+            "=" * 80,
+            "🚀 OMNI2 Bridge Application - Starting Up",
+            "=" * 80,
+            f"📦 Version: {__version__}",
+            f"🌍 Environment: {settings.app.environment}",
+            f"🐛 Debug Mode: {settings.app.debug}",
+            f"🔄 Auto-Reload: {settings.app.reload}",
+            f"🌐 Host: {settings.app.host}:{settings.app.port}",
+            "-" * 80,
+            "🤖 Anthropic Claude Configuration:",
+            f"   Model: {settings.llm.model}",
+            f"   Max Tokens: {settings.llm.max_tokens}",
+            f"   Timeout: {settings.llm.timeout}s",
+            f"   API Key: {llm_key_status}",
+            "-" * 80,
+            "🗄️  Database Configuration:",
+            f"   Host: {settings.database.host}:{settings.database.port}",
+            f"   Database: {settings.database.database}",
+            f"   User: {settings.database.user}",
+            f"   Pool Size: {settings.database.pool_size} (max overflow: {settings.database.max_overflow})",
+            "-" * 80,
+            "🔐 Security:",
+            f"   CORS Enabled: {settings.security.cors_enabled}",
+            f"   Secret Key: {secret_key_status}",
+            "-" * 80,
+        ]))
     
     try:
         # Initialize database connection
@@ -138,26 +222,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             break
         logger.info(f"✅ Loaded {len(mcp_registry.get_loaded_mcps())} MCPs")
         
-        # Start background tasks
-        logger.info("🔄 Starting background tasks...")
-        asyncio.create_task(health_check_loop())
-        asyncio.create_task(hot_reload_loop())
-        logger.info("✅ Background tasks started")
-        
-        # Log configuration summary
-        logger.info("✅ Configuration loaded successfully")
-        
-        # TODO: Initialize MCP discovery service
-        # TODO: Load users from database
-        # TODO: Start health check scheduler
-        
-        logger.info("=" * 80)
-        logger.info("✅ OMNI2 Bridge Application - Ready!")
-        logger.info(f"📖 API Documentation: http://{settings.app.host}:{settings.app.port}/docs")
-        logger.info(f"🏥 Health Check: http://{settings.app.host}:{settings.app.port}/health")
-        logger.info("=" * 80)
-        
-        yield
+        async with background_lifespan(app):
+            # Log configuration summary
+            logger.info("✅ Configuration loaded successfully")
+            
+            # TODO: Initialize MCP discovery service
+            # TODO: Load users from database
+            # TODO: Start health check scheduler
+            
+            if logger.is_enabled_for(logging.INFO):
+                base_url = f"http://{settings.app.host}:{settings.app.port}"
+                logger.info("\n".join([
+                    "=" * 80,
+                    "✅ OMNI2 Bridge Application - Ready!",
+                    f"📖 API Documentation: {base_url}/docs",
+                    f"🏥 Health Check: {base_url}/health",
+                    "=" * 80,
+                ]))
+            
+            yield
         
     finally:
         # Shutdown
@@ -166,11 +249,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Close MCP connections
         mcp_registry = get_mcp_registry()
         await mcp_registry.close_all()
+        await get_mcp_client().close()
         logger.info("✅ MCP connections closed")
         
         # Close database connections
         await close_db()
         logger.info("✅ Database connections closed")
+        
+        # Flush queued log records
+        stop_logging()
 
 
 # Initialize FastAPI application
@@ -216,7 +303,7 @@ async def global_exception_handler(request, exc: Exception):
         exc_info=True,
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -229,7 +316,7 @@ async def global_exception_handler(request, exc: Exception):
 # ============================================================
 # Register Routers
 # ============================================================
-from app.routers import tools, chat, audit, users, cache, admin
+from app.routers import tools, chat, audit, users, cache, admin, metrics
 
 app.include_router(health.router, tags=["Health"])
 app.include_router(tools.router, tags=["MCP Tools"])
@@ -238,6 +325,7 @@ app.include_router(audit.router, tags=["Audit"])
 app.include_router(users.router, tags=["Users"])
 app.include_router(cache.router, tags=["Cache"])
 app.include_router(admin.router, tags=["Admin"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 # TODO: Add more routers as we build them
 # app.include_router(query.router, prefix="/query", tags=["Query"])
@@ -248,17 +336,21 @@ app.include_router(admin.router, tags=["Admin"])
 # ============================================================
 # Root Endpoint
 # ============================================================
+# Static payload, serialized once at import instead of on every hit
+_ROOT_PAYLOAD = orjson.dumps({
+    "name": "OMNI2 Bridge",
+    "version": __version__,
+    "description": "Intelligent MCP orchestration with LLM routing",
+    "docs": "/docs",
+    "health": "/health",
+    "status": "running",
+})
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": "OMNI2 Bridge",
-        "version": __version__,
-        "description": "Intelligent MCP orchestration with LLM routing",
-        "docs": "/docs",
-        "health": "/health",
-        "status": "running",
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 # ============================================================
@@ -30,7 +30,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import INET, JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.database import Base
 
@@ -407,6 +407,14 @@ class RolePermission(Base):
     __tablename__ = "role_permissions"
     __table_args__ = (
         UniqueConstraint("role_name", "mcp_name", name="uq_role_mcp"),
+        # Active-row listings (migration 008)
+        Index(
+            "idx_role_permissions_active",
+            "role_name",
+            "mcp_name",
+            postgresql_include=["id", "mode", "allowed_tools", "denied_tools", "description"],
+            postgresql_where=text("is_active"),
+        ),
         {"schema": "omni2"}
     )
     
@@ -429,7 +437,16 @@ class TeamRole(Base):
     """Team to role mapping (team inherits role permissions)."""
     
     __tablename__ = "team_roles"
-    __table_args__ = {"schema": "omni2"}
+    __table_args__ = (
+        # Active-row listings (migration 008)
+        Index(
+            "idx_team_roles_active",
+            "team_name",
+            postgresql_include=["id", "default_role", "description"],
+            postgresql_where=text("is_active"),
+        ),
+        {"schema": "omni2"}
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     team_name = Column(String(100), unique=True, nullable=False, index=True)
@@ -9,13 +9,15 @@ Endpoints for managing MCP permissions:
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from typing import List, Optional
+from sqlalchemy import select, delete, update, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 
 from app.database import get_db
 from app.models import RolePermission, TeamRole, UserMCPPermission
-from app.services.user_service import get_user_service
+from app.services.cache_invalidation import invalidate_local_caches, notify_cache_invalidation
+from app.services.user_service import UserService, get_user_service
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/admin/permissions", tags=["admin", "permissions"])
@@ -48,109 +50,173 @@ class UserPermissionCreate(PermissionBase):
     mcp_name: str
 
 
+class RolePermissionOut(BaseModel):
+    id: int
+    role_name: Optional[str] = None  # Only in the all-roles listing
+    mcp_name: str
+    mode: str
+    allowed_tools: Optional[List[str]] = None
+    denied_tools: Optional[List[str]] = None
+    description: Optional[str] = None
+
+
+class TeamRoleOut(BaseModel):
+    id: int
+    team_name: str
+    default_role: str
+    description: Optional[str] = None
+
+
+class UserPermissionOut(BaseModel):
+    id: int
+    mcp_name: str
+    mode: str
+    allowed_tools: Optional[List[str]] = None
+    denied_tools: Optional[List[str]] = None
+
+
+# ============================================================================
+# Response Columns
+# ============================================================================
+# List endpoints select just these columns and return plain row dicts,
+# skipping ORM entity loading for read-only responses. The *Out response
+# models let FastAPI serialize them straight to JSON bytes via Pydantic.
+
+_ROLE_PERMISSION_FIELDS = (
+    RolePermission.mcp_name,
+    RolePermission.mode,
+    RolePermission.allowed_tools,
+    RolePermission.denied_tools,
+    RolePermission.description,
+)
+
+_TEAM_ROLE_FIELDS = (
+    TeamRole.id,
+    TeamRole.team_name,
+    TeamRole.default_role,
+    TeamRole.description,
+)
+
+_USER_PERMISSION_FIELDS = (
+    UserMCPPermission.id,
+    UserMCPPermission.mcp_name,
+    UserMCPPermission.mode,
+    UserMCPPermission.allowed_tools,
+    UserMCPPermission.denied_tools,
+)
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+async def _upsert(
+    db: AsyncSession,
+    model,
+    values: Dict[str, Any],
+    conflict_columns: Tuple[str, ...],
+) -> Tuple[int, bool]:
+    """
+    Insert a row, or update it in place when its unique key already exists.
+    
+    One INSERT ... ON CONFLICT DO UPDATE round trip (no lookup first, no
+    race between concurrent creates). Non-key values overwrite the existing
+    row and updated_at is bumped.
+    
+    Returns:
+        (row id, True if the row was created)
+    """
+    stmt = pg_insert(model).values(**values)
+    updates = {
+        column: stmt.excluded[column]
+        for column in values
+        if column not in conflict_columns
+    }
+    updates["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_=updates,
+    ).returning(
+        model.id,
+        # xmax is only set on rows written by the UPDATE branch
+        literal_column("xmax = 0").label("created"),
+    )
+    row = (await db.execute(stmt)).one()
+    await db.commit()
+    return row.id, row.created
+
+
 # ============================================================================
 # Role Permission Endpoints
 # ============================================================================
 
-@router.get("/roles")
+@router.get("/roles", response_model=List[RolePermissionOut])
 async def list_role_permissions(db: AsyncSession = Depends(get_db)):
     """List all role permissions"""
-    result = await db.execute(select(RolePermission).where(RolePermission.is_active == True))
-    permissions = result.scalars().all()
-    return [
-        {
-            "id": p.id,
-            "role_name": p.role_name,
-            "mcp_name": p.mcp_name,
-            "mode": p.mode,
-            "allowed_tools": p.allowed_tools,
-            "denied_tools": p.denied_tools,
-            "description": p.description
-        }
-        for p in permissions
-    ]
-
-
-@router.get("/roles/{role_name}")
+    result = await db.execute(
+        select(RolePermission.id, RolePermission.role_name, *_ROLE_PERMISSION_FIELDS)
+        .where(RolePermission.is_active == True)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+@router.get(
+    "/roles/{role_name}",
+    response_model=List[RolePermissionOut],
+    response_model_exclude_unset=True,
+)
 async def get_role_permissions(role_name: str, db: AsyncSession = Depends(get_db)):
     """Get permissions for specific role"""
     result = await db.execute(
-        select(RolePermission).where(
+        select(RolePermission.id, *_ROLE_PERMISSION_FIELDS).where(
             RolePermission.role_name == role_name,
             RolePermission.is_active == True
         )
     )
-    permissions = result.scalars().all()
-    return [
-        {
-            "id": p.id,
-            "mcp_name": p.mcp_name,
-            "mode": p.mode,
-            "allowed_tools": p.allowed_tools,
-            "denied_tools": p.denied_tools,
-            "description": p.description
-        }
-        for p in permissions
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 @router.post("/roles")
 async def create_role_permission(perm: RolePermissionCreate, db: AsyncSession = Depends(get_db)):
     """Create or update role permission"""
-    # Check if exists
-    result = await db.execute(
-        select(RolePermission).where(
-            RolePermission.role_name == perm.role_name,
-            RolePermission.mcp_name == perm.mcp_name
-        )
+    perm_id, created = await _upsert(
+        db,
+        RolePermission,
+        values={
+            "role_name": perm.role_name,
+            "mcp_name": perm.mcp_name,
+            "mode": perm.mode,
+            "allowed_tools": perm.allowed_tools,
+            "denied_tools": perm.denied_tools,
+            "description": perm.description,
+            "is_active": True,
+        },
+        conflict_columns=("role_name", "mcp_name"),
     )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        # Update
-        existing.mode = perm.mode
-        existing.allowed_tools = perm.allowed_tools
-        existing.denied_tools = perm.denied_tools
-        existing.description = perm.description
-        existing.is_active = True
-        await db.commit()
-        await db.refresh(existing)
-        logger.info(f"Updated role permission: {perm.role_name}/{perm.mcp_name}")
-        return {"status": "updated", "id": existing.id}
-    else:
-        # Create
-        new_perm = RolePermission(
-            role_name=perm.role_name,
-            mcp_name=perm.mcp_name,
-            mode=perm.mode,
-            allowed_tools=perm.allowed_tools,
-            denied_tools=perm.denied_tools,
-            description=perm.description
-        )
-        db.add(new_perm)
-        await db.commit()
-        await db.refresh(new_perm)
-        logger.info(f"Created role permission: {perm.role_name}/{perm.mcp_name}")
-        return {"status": "created", "id": new_perm.id}
+    if created:
+        logger.info("Created role permission", role=perm.role_name, mcp=perm.mcp_name)
+        return {"status": "created", "id": perm_id}
+    logger.info("Updated role permission", role=perm.role_name, mcp=perm.mcp_name)
+    return {"status": "updated", "id": perm_id}
 
 
 @router.delete("/roles/{role_name}/{mcp_name}")
 async def delete_role_permission(role_name: str, mcp_name: str, db: AsyncSession = Depends(get_db)):
     """Delete role permission (soft delete)"""
     result = await db.execute(
-        select(RolePermission).where(
+        update(RolePermission)
+        .where(
             RolePermission.role_name == role_name,
             RolePermission.mcp_name == mcp_name
         )
+        .values(is_active=False)
+        .returning(RolePermission.id)
     )
-    perm = result.scalar_one_or_none()
-    
-    if not perm:
+    if result.first() is None:
         raise HTTPException(status_code=404, detail="Permission not found")
     
-    perm.is_active = False
     await db.commit()
-    logger.info(f"Deleted role permission: {role_name}/{mcp_name}")
+    logger.info("Deleted role permission", role=role_name, mcp=mcp_name)
     return {"status": "deleted"}
 
 
@@ -158,68 +224,48 @@ async def delete_role_permission(role_name: str, mcp_name: str, db: AsyncSession
 # Team Role Endpoints
 # ============================================================================
 
-@router.get("/teams")
+@router.get("/teams", response_model=List[TeamRoleOut])
 async def list_team_roles(db: AsyncSession = Depends(get_db)):
     """List all team roles"""
-    result = await db.execute(select(TeamRole).where(TeamRole.is_active == True))
-    teams = result.scalars().all()
-    return [
-        {
-            "id": t.id,
-            "team_name": t.team_name,
-            "default_role": t.default_role,
-            "description": t.description
-        }
-        for t in teams
-    ]
+    result = await db.execute(select(*_TEAM_ROLE_FIELDS).where(TeamRole.is_active == True))
+    return [dict(row) for row in result.mappings()]
 
 
 @router.post("/teams")
 async def create_team_role(team: TeamRoleCreate, db: AsyncSession = Depends(get_db)):
     """Create or update team role"""
-    # Check if exists
-    result = await db.execute(
-        select(TeamRole).where(TeamRole.team_name == team.team_name)
+    team_id, created = await _upsert(
+        db,
+        TeamRole,
+        values={
+            "team_name": team.team_name,
+            "default_role": team.default_role,
+            "description": team.description,
+            "is_active": True,
+        },
+        conflict_columns=("team_name",),
     )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        # Update
-        existing.default_role = team.default_role
-        existing.description = team.description
-        existing.is_active = True
-        await db.commit()
-        await db.refresh(existing)
-        logger.info(f"Updated team role: {team.team_name} -> {team.default_role}")
-        return {"status": "updated", "id": existing.id}
-    else:
-        # Create
-        new_team = TeamRole(
-            team_name=team.team_name,
-            default_role=team.default_role,
-            description=team.description
-        )
-        db.add(new_team)
-        await db.commit()
-        await db.refresh(new_team)
-        logger.info(f"Created team role: {team.team_name} -> {team.default_role}")
-        return {"status": "created", "id": new_team.id}
+    if created:
+        logger.info("Created team role", team=team.team_name, role=team.default_role)
+        return {"status": "created", "id": team_id}
+    logger.info("Updated team role", team=team.team_name, role=team.default_role)
+    return {"status": "updated", "id": team_id}
 
 
 @router.delete("/teams/{team_name}")
 async def delete_team_role(team_name: str, db: AsyncSession = Depends(get_db)):
     """Delete team role (soft delete)"""
     result = await db.execute(
-        select(TeamRole).where(TeamRole.team_name == team_name)
+        update(TeamRole)
+        .where(TeamRole.team_name == team_name)
+        .values(is_active=False)
+        .returning(TeamRole.id)
     )
-    team = result.scalar_one_or_none()
-    
-    if not team:
+    if result.first() is None:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    team.is_active = False
     await db.commit()
-    logger.info(f"Deleted team role: {team_name}")
+    logger.info("Deleted team role", team=team_name)
     return {"status": "deleted"}
 
 
@@ -227,74 +273,54 @@ async def delete_team_role(team_name: str, db: AsyncSession = Depends(get_db)):
 # User Permission Endpoints
 # ============================================================================
 
-@router.get("/users/{user_id}")
+@router.get("/users/{user_id}", response_model=List[UserPermissionOut])
 async def get_user_permissions(user_id: int, db: AsyncSession = Depends(get_db)):
     """Get user-specific permission overrides"""
     result = await db.execute(
-        select(UserMCPPermission).where(UserMCPPermission.user_id == user_id)
+        select(*_USER_PERMISSION_FIELDS).where(UserMCPPermission.user_id == user_id)
     )
-    permissions = result.scalars().all()
-    return [
-        {
-            "id": p.id,
-            "mcp_name": p.mcp_name,
-            "mode": p.mode,
-            "allowed_tools": p.allowed_tools,
-            "denied_tools": p.denied_tools
-        }
-        for p in permissions
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 @router.post("/users")
-async def create_user_permission(perm: UserPermissionCreate, db: AsyncSession = Depends(get_db)):
+async def create_user_permission(
+    perm: UserPermissionCreate,
+    db: AsyncSession = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
+):
     """Create or update user-specific permission override"""
-    # Check if exists
-    result = await db.execute(
-        select(UserMCPPermission).where(
-            UserMCPPermission.user_id == perm.user_id,
-            UserMCPPermission.mcp_name == perm.mcp_name
-        )
+    # Other workers drop their caches when _upsert commits this transaction
+    await notify_cache_invalidation(db, str(perm.user_id))
+    perm_id, created = await _upsert(
+        db,
+        UserMCPPermission,
+        values={
+            "user_id": perm.user_id,
+            "mcp_name": perm.mcp_name,
+            "mode": perm.mode,
+            "allowed_tools": perm.allowed_tools,
+            "denied_tools": perm.denied_tools,
+        },
+        conflict_columns=("user_id", "mcp_name"),
     )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        # Update
-        existing.mode = perm.mode
-        existing.allowed_tools = perm.allowed_tools
-        existing.denied_tools = perm.denied_tools
-        await db.commit()
-        await db.refresh(existing)
-        logger.info(f"Updated user permission: user={perm.user_id}, mcp={perm.mcp_name}")
-        
-        # Invalidate cache
-        user_service = get_user_service()
-        user_service.invalidate_permission_cache(str(perm.user_id))
-        
-        return {"status": "updated", "id": existing.id}
+    if created:
+        logger.info("Created user permission", user_id=perm.user_id, mcp=perm.mcp_name)
     else:
-        # Create
-        new_perm = UserMCPPermission(
-            user_id=perm.user_id,
-            mcp_name=perm.mcp_name,
-            mode=perm.mode,
-            allowed_tools=perm.allowed_tools,
-            denied_tools=perm.denied_tools
-        )
-        db.add(new_perm)
-        await db.commit()
-        await db.refresh(new_perm)
-        logger.info(f"Created user permission: user={perm.user_id}, mcp={perm.mcp_name}")
-        
-        # Invalidate cache
-        user_service = get_user_service()
-        user_service.invalidate_permission_cache(str(perm.user_id))
-        
-        return {"status": "created", "id": new_perm.id}
+        logger.info("Updated user permission", user_id=perm.user_id, mcp=perm.mcp_name)
+    
+    # Invalidate cache
+    invalidate_local_caches(user_service, str(perm.user_id))
+    
+    return {"status": "created" if created else "updated", "id": perm_id}
 
 
 @router.delete("/users/{user_id}/{mcp_name}")
-async def delete_user_permission(user_id: int, mcp_name: str, db: AsyncSession = Depends(get_db)):
+async def delete_user_permission(
+    user_id: int,
+    mcp_name: str,
+    db: AsyncSession = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
+):
     """Delete user permission override"""
     result = await db.execute(
         delete(UserMCPPermission).where(
@@ -302,13 +328,14 @@ async def delete_user_permission(user_id: int, mcp_name: str, db: AsyncSession =
             UserMCPPermission.mcp_name == mcp_name
         )
     )
+    # Other workers drop their caches on commit
+    await notify_cache_invalidation(db, str(user_id))
     await db.commit()
     
     # Invalidate cache
-    user_service = get_user_service()
-    user_service.invalidate_permission_cache(str(user_id))
+    invalidate_local_caches(user_service, str(user_id))
     
-    logger.info(f"Deleted user permission: user={user_id}, mcp={mcp_name}")
+    logger.info("Deleted user permission", user_id=user_id, mcp=mcp_name)
     return {"status": "deleted"}
 
 
@@ -317,12 +344,17 @@ async def delete_user_permission(user_id: int, mcp_name: str, db: AsyncSession =
 # ============================================================================
 
 @router.post("/cache/invalidate")
-async def invalidate_permission_cache(user_id: Optional[int] = None):
-    """Invalidate permission cache"""
-    user_service = get_user_service()
+async def invalidate_permission_cache(
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
+):
+    """Invalidate permission cache (in every worker)"""
+    target = str(user_id) if user_id else None
+    await notify_cache_invalidation(db, target)
+    await db.commit()
+    invalidate_local_caches(user_service, target)
     if user_id:
-        user_service.invalidate_permission_cache(str(user_id))
         return {"status": "ok", "message": f"Cache invalidated for user {user_id}"}
     else:
-        user_service.invalidate_permission_cache()
         return {"status": "ok", "message": "All permission caches invalidated"}
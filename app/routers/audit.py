@@ -5,7 +5,7 @@ API endpoints for querying audit logs and usage statistics.
 """
 
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,9 @@ from app.utils.logger import logger
 
 router = APIRouter(prefix="/audit")
 
+# Accepted ?status= values (AuditService.LOG_STATUSES); anything else is a 422
+_STATUS_PATTERN = "^(" + "|".join(sorted(AuditService.LOG_STATUSES)) + ")$"
+
 
 # ============================================================
 # Response Models
@@ -62,6 +65,52 @@ class AuditStatsResponse(BaseModel):
     period_days: int
 
 
+# ============================================================
+# Helpers
+# ============================================================
+
+def _window_start(days: int) -> datetime:
+    """Start of the trailing `days` window (UTC, same as the stats window)."""
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+async def _scope_user_filter(
+    user_service: UserService,
+    requesting_user: str,
+    user_id: Optional[str],
+    forbidden_detail: str,
+) -> Optional[str]:
+    """
+    Resolve the user filter for an admin-aware endpoint.
+    
+    Admins may filter by any user (or none); everyone else is pinned to
+    their own email and gets a 403 when asking for someone else's data.
+    """
+    requesting_user_data = await user_service.get_user(requesting_user)
+    is_admin = bool(requesting_user_data.get("is_super_admin")) or requesting_user_data.get("role") == "admin"
+    
+    if is_admin:
+        return user_id
+    if user_id and user_id != requesting_user:
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    return requesting_user
+
+
+def _stats_response(stats: dict, days: int) -> AuditStatsResponse:
+    """Build the stats response from an AuditService.get_stats() result."""
+    return AuditStatsResponse(
+        total_requests=stats.get("total_requests", 0),
+        total_tool_calls=stats.get("total_tool_calls", 0),
+        avg_iterations=float(stats.get("avg_iterations", 0) or 0),
+        avg_duration_ms=float(stats.get("avg_duration_ms", 0) or 0),
+        total_cost=float(stats.get("total_cost", 0) or 0),
+        error_count=stats.get("error_count", 0),
+        success_count=stats.get("success_count", 0),
+        warning_count=stats.get("warning_count", 0),
+        period_days=days,
+    )
+
+
 # ============================================================
 # Endpoints
 # ============================================================
@@ -69,7 +118,7 @@ class AuditStatsResponse(BaseModel):
 @router.get("/logs", response_model=AuditLogsResponse)
 async def get_audit_logs(
     user_id: Optional[str] = Query(None, description="Filter by user email"),
-    status: Optional[str] = Query(None, description="Filter by status (success, error, warning)"),
+    status: Optional[str] = Query(None, description="Filter by status (success, error, warning)", pattern=_STATUS_PATTERN),
     mcp_name: Optional[str] = Query(None, description="Filter by MCP name"),
     days: int = Query(7, description="Number of days to include", ge=1, le=90),
     limit: int = Query(100, description="Maximum results", ge=1, le=1000),
@@ -104,21 +153,11 @@ async def get_audit_logs(
         ```
     """
     try:
-        # Check permissions
-        requesting_user_data = await user_service.get_user(requesting_user)
-        is_admin = bool(requesting_user_data.get("is_super_admin")) or requesting_user_data.get("role") == "admin"
-        
-        # Regular users can only see their own logs
-        if not is_admin:
-            if user_id and user_id != requesting_user:
-                raise HTTPException(
-                    status_code=403,
-                    detail="You can only view your own audit logs"
-                )
-            user_id = requesting_user
-        
-        # Calculate date range
-        start_date = datetime.now() - timedelta(days=days)
+        # Check permissions (regular users can only see their own logs)
+        user_id = await _scope_user_filter(
+            user_service, requesting_user, user_id,
+            "You can only view your own audit logs",
+        )
         
         # Query logs
         logs = await audit_service.get_logs(
@@ -127,7 +166,7 @@ async def get_audit_logs(
             offset=offset,
             status=status,
             mcp_name=mcp_name,
-            start_date=start_date,
+            start_date=_window_start(days),
         )
         
         logger.info(
@@ -188,18 +227,11 @@ async def get_audit_stats(
         ```
     """
     try:
-        # Check permissions
-        requesting_user_data = await user_service.get_user(requesting_user)
-        is_admin = bool(requesting_user_data.get("is_super_admin")) or requesting_user_data.get("role") == "admin"
-        
-        # Regular users can only see their own stats
-        if not is_admin:
-            if user_id and user_id != requesting_user:
-                raise HTTPException(
-                    status_code=403,
-                    detail="You can only view your own statistics"
-                )
-            user_id = requesting_user
+        # Check permissions (regular users can only see their own stats)
+        user_id = await _scope_user_filter(
+            user_service, requesting_user, user_id,
+            "You can only view your own statistics",
+        )
         
         # Get stats
         stats = await audit_service.get_stats(
@@ -214,17 +246,7 @@ async def get_audit_stats(
             days=days,
         )
         
-        return AuditStatsResponse(
-            total_requests=stats.get("total_requests", 0),
-            total_tool_calls=stats.get("total_tool_calls", 0),
-            avg_iterations=float(stats.get("avg_iterations", 0) or 0),
-            avg_duration_ms=float(stats.get("avg_duration_ms", 0) or 0),
-            total_cost=float(stats.get("total_cost", 0) or 0),
-            error_count=stats.get("error_count", 0),
-            success_count=stats.get("success_count", 0),
-            warning_count=stats.get("warning_count", 0),
-            period_days=days,
-        )
+        return _stats_response(stats, days)
         
     except HTTPException:
         raise
@@ -242,7 +264,7 @@ async def get_audit_stats(
 
 @router.get("/my-logs", response_model=AuditLogsResponse)
 async def get_my_audit_logs(
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status: Optional[str] = Query(None, description="Filter by status", pattern=_STATUS_PATTERN),
     days: int = Query(7, description="Number of days to include", ge=1, le=90),
     limit: int = Query(50, description="Maximum results", ge=1, le=500),
     offset: int = Query(0, description="Pagination offset", ge=0),
@@ -271,14 +293,12 @@ async def get_my_audit_logs(
         ```
     """
     try:
-        start_date = datetime.now() - timedelta(days=days)
-        
         logs = await audit_service.get_logs(
             user_id=user_id,
             limit=limit,
             offset=offset,
             status=status,
-            start_date=start_date,
+            start_date=_window_start(days),
         )
         
         return AuditLogsResponse(
@@ -330,17 +350,7 @@ async def get_my_audit_stats(
             days=days,
         )
         
-        return AuditStatsResponse(
-            total_requests=stats.get("total_requests", 0),
-            total_tool_calls=stats.get("total_tool_calls", 0),
-            avg_iterations=float(stats.get("avg_iterations", 0) or 0),
-            avg_duration_ms=float(stats.get("avg_duration_ms", 0) or 0),
-            total_cost=float(stats.get("total_cost", 0) or 0),
-            error_count=stats.get("error_count", 0),
-            success_count=stats.get("success_count", 0),
-            warning_count=stats.get("warning_count", 0),
-            period_days=days,
-        )
+        return _stats_response(stats, days)
         
     except Exception as e:
         logger.error(
@@ -3,6 +3,7 @@ Cache Management Router
 
 Endpoints for invalidating and managing auth_client cache.
 Called by auth_service when user data changes.
+Also exposes the audit stats cache (metrics and manual purge).
 """
 
 from fastapi import APIRouter, HTTPException
@@ -10,9 +11,11 @@ from typing import Optional
 from pydantic import BaseModel
 
 from app.services import auth_client
+from app.services.audit_service import get_audit_service
 from app.utils.logger import logger
+from app.utils.responses import ORJSONResponse
 
-router = APIRouter(prefix="/cache", tags=["cache"])
+router = APIRouter(prefix="/cache", tags=["cache"], default_response_class=ORJSONResponse)
 
 
 class InvalidateRequest(BaseModel):
@@ -42,7 +45,7 @@ async def invalidate_cache(request: InvalidateRequest):
         email=request.email
     )
     
-    logger.info(f"Cache invalidated: {result}")
+    logger.info("Cache invalidated", invalidated=result)
     return {"status": "ok", "invalidated": result}
 
 
@@ -58,7 +61,7 @@ async def invalidate_user_by_id(user_id: int):
         Invalidation status
     """
     result = auth_client.invalidate_user_cache(user_id=user_id)
-    logger.info(f"Cache invalidated for user {user_id}: {result}")
+    logger.info("Cache invalidated for user", user_id=user_id, invalidated=result)
     return {"status": "ok", "user_id": user_id, "invalidated": result}
 
 
@@ -73,17 +76,33 @@ async def clear_all_cache():
         Count of cleared entries
     """
     result = auth_client.clear_all_cache()
-    logger.warning(f"All cache cleared: {result}")
+    logger.warning("All cache cleared", cleared=result)
     return {"status": "ok", "cleared": result}
 
 
+@router.post("/clear/audit-stats")
+async def clear_audit_stats_cache():
+    """
+    Clear cached audit statistics.
+    
+    The next /audit/stats request for each window is recomputed from the database.
+    
+    Returns:
+        Count of cleared entries
+    """
+    cleared = get_audit_service().clear_stats_cache()
+    return {"status": "ok", "cleared": cleared}
+
+
 @router.get("/stats")
 async def get_cache_stats():
     """
     Get cache statistics.
     
     Returns:
-        Cache size, valid entries, TTL
+        Cache size, valid entries, TTL (auth cache) and audit stats cache
+        size/hit counts
     """
     stats = auth_client.get_cache_stats()
-    return {"status": "ok", "stats": stats}
+    audit_stats = get_audit_service().get_stats_cache_stats()
+    return {"status": "ok", "stats": stats, "audit_stats": audit_stats}
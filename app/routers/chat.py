@@ -5,10 +5,11 @@ LLM-powered chat interface for intelligent MCP routing.
 """
 
 import time
-import json
 import math
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
@@ -58,19 +59,28 @@ def _format_usage_limit_error(limit_status: dict) -> str:
         exceeded.append("cost")
 
     exceeded_label = ", ".join(exceeded) if exceeded else "usage"
-    message = f"Usage limit exceeded ({exceeded_label})."
+    parts = [f"Usage limit exceeded ({exceeded_label})."]
 
     reset_at = limit_status.get("window_end")
     if isinstance(reset_at, datetime):
         delta = reset_at - datetime.utcnow()
         reset_in_days = max(0, math.ceil(delta.total_seconds() / 86400)) if delta.total_seconds() > 0 else 0
+        reset_iso = reset_at.isoformat()
         if reset_in_days == 0:
-            message += f" Window resets at {reset_at.isoformat()} UTC."
+            parts.append(f"Window resets at {reset_iso} UTC.")
         elif reset_in_days == 1:
-            message += f" Window resets in 1 day at {reset_at.isoformat()} UTC."
+            parts.append(f"Window resets in 1 day at {reset_iso} UTC.")
         else:
-            message += f" Window resets in {reset_in_days} days at {reset_at.isoformat()} UTC."
-    return message
+            parts.append(f"Window resets in {reset_in_days} days at {reset_iso} UTC.")
+    return " ".join(parts)
+
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event; orjson writes the UTF-8 payload directly."""
+    return b"event: %s\ndata: %s\n\n" % (
+        event.encode(),
+        orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
+    )
 
 
 # ============================================================
@@ -329,7 +339,7 @@ async def ask_question_stream(
         )
 
         async def error_stream():
-            yield f"event: error\ndata: {json.dumps({'error': error_msg})}\n\n"
+            yield _sse_event("error", {"error": error_msg})
 
         return StreamingResponse(
             error_stream(),
@@ -355,7 +365,7 @@ async def ask_question_stream(
         )
 
         async def limit_error_stream():
-            yield f"event: error\ndata: {json.dumps({'error': error_msg})}\n\n"
+            yield _sse_event("error", {"error": error_msg})
 
         return StreamingResponse(
             limit_error_stream(),
@@ -388,8 +398,7 @@ async def ask_question_stream(
                 is_admin_dashboard=is_admin_dashboard,
             ):
                 if event.get("type") == "token":
-                    payload = json.dumps({"text": event.get("text", "")})
-                    yield f"event: token\ndata: {payload}\n\n"
+                    yield _sse_event("token", {"text": event.get("text", "")})
                 elif event.get("type") == "done":
                     result = event.get("result", {})
                     duration_ms = int((time.time() - start_time) * 1000)
@@ -405,7 +414,7 @@ async def ask_question_stream(
                         slack_message_ts=slack_message_ts,
                         slack_thread_ts=slack_thread_ts,
                     )
-                    yield f"event: done\ndata: {json.dumps(result)}\n\n"
+                    yield _sse_event("done", result)
                 elif event.get("type") == "error":
                     duration_ms = int((time.time() - start_time) * 1000)
                     await audit_service.log_error(
@@ -416,7 +425,7 @@ async def ask_question_stream(
                         ip_address=http_request.client.host if http_request.client else None,
                         user_agent=http_request.headers.get("user-agent"),
                     )
-                    yield f"event: error\ndata: {json.dumps({'error': event.get('error', 'Streaming error')})}\n\n"
+                    yield _sse_event("error", {"error": event.get("error", "Streaming error")})
                     return
         except Exception as e:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -428,7 +437,7 @@ async def ask_question_stream(
                 ip_address=http_request.client.host if http_request.client else None,
                 user_agent=http_request.headers.get("user-agent"),
             )
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            yield _sse_event("error", {"error": str(e)})
 
     return StreamingResponse(
         event_stream(),
@@ -8,10 +8,14 @@ Provides application health status including:
 - System information
 """
 
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import __version__
@@ -19,35 +23,85 @@ from app.config import settings
 from app.database import check_db_health, get_db
 from app.models import MCPServer
 from app.services.mcp_registry import get_mcp_registry
+from app.services.mcp_repository import MCPServerRepository, get_mcp_repo
 from app.utils.logger import logger
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 
 router = APIRouter()
 
+# /health snapshots reused for bursts of probes (load balancers, k8s, dashboards),
+# keyed by the detail flag: detail -> {"data", "timestamp"}
+HEALTH_CACHE_TTL = 1.5
+_health_cache: Dict[bool, Dict] = {}
+_health_lock = asyncio.Lock()
 
-@router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
+# MCP summary (mcp_servers rows, updated by the background health loop)
+# changes far less often than the database probe needs to run: keep it longer.
+# Only refreshed from _compute_health(), i.e. under _health_lock.
+MCP_HEALTH_CACHE_TTL = 5.0
+_mcp_health_cache: Dict[bool, Dict] = {}
+
+
+@lru_cache(maxsize=2)
+def _format_timestamp(second: int) -> str:
+    """ISO-8601 UTC timestamp for a whole epoch second (current + previous kept)."""
+    return datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+
+
+def _timestamp() -> str:
+    """Current UTC time at one-second resolution, formatted once per second."""
+    return _format_timestamp(int(time.time()))
+
+
+def _mcp_status(enabled_count: int, healthy_count: int) -> str:
+    """Overall MCP status from enabled/healthy server counts."""
+    if enabled_count == 0:
+        return "no_servers"
+    if healthy_count == enabled_count:
+        return "healthy"
+    if healthy_count > 0:
+        return "degraded"
+    return "unhealthy"
+
+
+async def _mcp_health_summary(db: AsyncSession, detail: bool = True) -> Dict:
     """
-    Health check endpoint.
+    Summarize MCP server health as recorded in the database.
     
-    Returns:
-        - status: overall health (healthy/degraded/unhealthy)
-        - version: application version
-        - timestamp: current server time
-        - database: database connection status
-        - mcps: MCP server health summary (from database)
+    With detail=False only the counters are returned, computed by a single
+    aggregate query instead of fetching every server row.
     """
-    logger.debug("Health check requested")
-    
-    # Check database
-    db_health = await check_db_health()
-    
-    # Check MCP servers from database
-    mcp_health = {"status": "unknown", "servers": []}
     try:
-        result = await db.execute(select(MCPServer))
-        mcps = result.scalars().all()
+        if not detail:
+            active = MCPServer.status == 'active'
+            result = await db.execute(
+                select(
+                    func.count().filter(active),
+                    func.count().filter(active, MCPServer.health_status == 'healthy'),
+                    func.count(),
+                )
+            )
+            enabled_count, healthy_count, configured_count = result.one()
+            return {
+                "status": _mcp_status(enabled_count, healthy_count),
+                "healthy": healthy_count,
+                "enabled": enabled_count,
+                "configured": configured_count,
+            }
+        
+        # Just the rendered columns: plain rows, no ORM entities
+        result = await db.execute(
+            select(
+                MCPServer.name,
+                MCPServer.url,
+                MCPServer.protocol,
+                MCPServer.status,
+                MCPServer.health_status,
+                MCPServer.last_health_check,
+            )
+        )
+        mcps = result.all()
         
         configured_mcps = []
         enabled_count = 0
@@ -60,7 +114,7 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
                 "protocol": mcp.protocol,
                 "enabled": mcp.status == 'active',
                 "status": mcp.health_status,
-                "last_check": mcp.last_health_check.isoformat() if mcp.last_health_check else None
+                "last_check": mcp.last_health_check,
             }
             
             configured_mcps.append(mcp_info)
@@ -70,17 +124,8 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
                 if mcp.health_status == 'healthy':
                     healthy_count += 1
         
-        if enabled_count == 0:
-            mcp_status = "no_servers"
-        elif healthy_count == enabled_count:
-            mcp_status = "healthy"
-        elif healthy_count > 0:
-            mcp_status = "degraded"
-        else:
-            mcp_status = "unhealthy"
-        
-        mcp_health = {
-            "status": mcp_status,
+        return {
+            "status": _mcp_status(enabled_count, healthy_count),
             "healthy": healthy_count,
             "enabled": enabled_count,
             "configured": len(configured_mcps),
@@ -89,10 +134,81 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
     
     except Exception as e:
         logger.error("Failed to check MCP health", error=str(e))
-        mcp_health = {
+        return {
             "status": "error",
             "error": str(e),
         }
+
+
+async def _cached_mcp_health_summary(db: AsyncSession, detail: bool) -> Dict:
+    """
+    MCP health summary, reused for MCP_HEALTH_CACHE_TTL seconds.
+    
+    Errors are not cached. If the query fails (e.g. database unreachable),
+    the last good summary is returned instead, marked stale, so dashboards
+    keep the server list; the database section still reports the outage.
+    """
+    cached = _mcp_health_cache.get(detail)
+    if cached is not None and time.monotonic() - cached["timestamp"] < MCP_HEALTH_CACHE_TTL:
+        return cached["data"]
+    
+    summary = await _mcp_health_summary(db, detail)
+    if summary["status"] != "error":
+        _mcp_health_cache[detail] = {"data": summary, "timestamp": time.monotonic()}
+    elif cached is not None:
+        return {
+            **cached["data"],
+            "stale": True,
+            "stale_reason": summary["error"],
+            "stale_age_seconds": round(time.monotonic() - cached["timestamp"], 1),
+        }
+    return summary
+
+
+@router.get("/health")
+async def health_check(
+    response: Response,
+    detail: bool = Query(True, description="Include the per-server list under mcps.servers"),
+    db: AsyncSession = Depends(get_db),
+) -> Dict:
+    """
+    Health check endpoint.
+    
+    Responds 503 when unhealthy (database down) so load balancers stop
+    routing to this instance; healthy and degraded respond 200.
+    
+    Returns:
+        - status: overall health (healthy/degraded/unhealthy)
+        - version: application version
+        - timestamp: current server time
+        - database: database connection status
+        - mcps: MCP server health summary (from database; counters only
+          with ?detail=false)
+    
+    The result is cached for HEALTH_CACHE_TTL seconds; concurrent requests
+    during a refresh wait for it instead of probing again.
+    """
+    async with _health_lock:
+        cached = _health_cache.get(detail)
+        if cached is not None and time.monotonic() - cached["timestamp"] < HEALTH_CACHE_TTL:
+            health = cached["data"]
+        else:
+            health = await _compute_health(db, detail)
+            _health_cache[detail] = {"data": health, "timestamp": time.monotonic()}
+    
+    if health["status"] == "unhealthy":
+        response.status_code = 503
+    return health
+
+
+async def _compute_health(db: AsyncSession, detail: bool) -> Dict:
+    """Probe the database and summarize MCP health."""
+    # Database probe (own connection) and MCP summary (request session) are
+    # independent: run them concurrently
+    db_health, mcp_health = await asyncio.gather(
+        check_db_health(),
+        _cached_mcp_health_summary(db, detail),
+    )
     
     # Determine overall status
     if db_health["status"] == "healthy":
@@ -108,7 +224,7 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
     return {
         "status": overall_status,
         "version": __version__,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _timestamp(),
         "environment": settings.app.environment,
         "database": db_health,
         "mcps": mcp_health,
@@ -117,32 +233,40 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> Dict:
 
 
 @router.get("/health/ready")
-async def readiness_check() -> Dict:
+async def readiness_check(response: Response) -> Dict:
     """
     Kubernetes-style readiness probe.
     
-    Returns 200 if app is ready to serve traffic.
+    Returns 200 if app is ready to serve traffic, 503 otherwise.
     """
     db_health = await check_db_health()
     
     if db_health["status"] == "healthy":
         return {"ready": True}
     else:
+        response.status_code = 503
         return {"ready": False, "reason": "Database unavailable"}
 
 
+@lru_cache(maxsize=2)
+def _live_payload(second: int) -> bytes:
+    """Serialized /health/live body for a whole epoch second (current + previous kept)."""
+    return orjson.dumps({
+        "alive": True,
+        "version": __version__,
+        "timestamp": _format_timestamp(second),
+    })
+
+
 @router.get("/health/live")
-async def liveness_check() -> Dict:
+async def liveness_check() -> Response:
     """
     Kubernetes-style liveness probe.
     
-    Returns 200 if app is alive (even if degraded).
+    Returns 200 if app is alive (even if degraded). The body is serialized
+    once per second and written as-is.
     """
-    return {
-        "alive": True,
-        "version": __version__,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+    return Response(content=_live_payload(int(time.time())), media_type="application/json")
 
 
 @router.get("/health/cache")
@@ -167,7 +291,8 @@ async def cache_stats() -> Dict:
 @router.post("/health/cache/invalidate")
 async def invalidate_cache(
     server_name: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    mcp_repo: MCPServerRepository = Depends(get_mcp_repo),
 ) -> Dict:
     """
     Invalidate tool schema cache by reloading MCP.
@@ -179,8 +304,7 @@ async def invalidate_cache(
     
     if server_name:
         await mcp_registry.unload_mcp(server_name, db)
-        result = await db.execute(select(MCPServer).where(MCPServer.name == server_name))
-        mcp = result.scalar_one_or_none()
+        mcp = await mcp_repo.get_by_name(server_name)
         if mcp:
             await mcp_registry.load_mcp(mcp, db)
     else:
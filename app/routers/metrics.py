@@ -0,0 +1,30 @@
+"""
+Metrics Endpoint
+
+Exposes Prometheus metrics (see app.utils.metrics) for scraping.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR (an empty
+directory, cleared before start) so every worker records its samples there
+and each scrape returns the totals across all workers. Without it, a scrape
+only covers the worker that answered it.
+"""
+
+import os
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus text exposition of all registered collectors."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate the per-worker sample files
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -4,64 +4,53 @@ MCP Tools Router
 Exposes MCP tool discovery and execution endpoints.
 """
 
-from typing import Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
+import time
+from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.mcp_registry import get_mcp_registry
+from app.schemas.tools import ToolCallRequest, ToolCallResponse
+from app.services.mcp_registry import MCPRegistry, get_mcp_registry
+from app.services.mcp_repository import MCPServerRepository, get_mcp_repo
+from app.services.user_service import UserService, get_user_service
 from app.database import get_db
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.logger import logger
+from app.utils.responses import ORJSONResponse
 
 
 router = APIRouter(prefix="/mcp/tools")
 
+# /servers responses without live health probes, reused for polling clients.
+# Keyed by enabled_only: enabled_only -> {"data", "timestamp"}
+SERVERS_CACHE_TTL = 15
+_servers_cache: Dict[bool, Dict[str, Any]] = {}
 
-# ============================================================
-# Request/Response Models
-# ============================================================
-
-class ToolCallRequest(BaseModel):
-    """Request model for calling an MCP tool."""
-    
-    server: str = Field(..., description="MCP server name")
-    tool: str = Field(..., description="Tool name to execute")
-    arguments: Dict[str, Any] = Field(default={}, description="Tool arguments")
-
-
-class ToolCallResponse(BaseModel):
-    """Response model for tool execution."""
-    
-    success: bool
-    server: str
-    tool: str
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
+# Live probes for /servers?include_health=true run at most this many at a time
+SERVERS_HEALTH_CONCURRENCY = 8
 
 
 # ============================================================
 # Endpoints
 # ============================================================
 
-@router.get("/list")
+@router.get("/list", response_class=ORJSONResponse)
 async def list_tools(
     server: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
 ):
     """
     List available tools from MCP servers.
     
     Args:
         server: Optional server name to filter by
-        db: Database session
+        mcp_registry: MCP registry (injected)
         
     Returns:
         Dict with tools grouped by server
     """
     try:
-        logger.info("📋 Listing MCP tools", server_filter=server)
+        logger.debug("📋 Listing MCP tools", server_filter=server)
         
-        mcp_registry = get_mcp_registry()
         tools = mcp_registry.get_tools(server)
         
         return {
@@ -77,14 +66,14 @@ async def list_tools(
 @router.post("/call")
 async def call_tool(
     request: ToolCallRequest,
-    db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
 ) -> ToolCallResponse:
     """
     Execute an MCP tool.
     
     Args:
         request: Tool call request
-        db: Database session
+        mcp_registry: MCP registry (injected)
         
     Returns:
         Tool execution result
@@ -92,13 +81,14 @@ async def call_tool(
     try:
         logger.info("🔧 Executing MCP tool", server=request.server, tool=request.tool)
         
-        mcp_registry = get_mcp_registry()
         result = await mcp_registry.call_tool(request.server, request.tool, request.arguments)
         
         if result.get("status") == "error":
             raise HTTPException(status_code=500, detail=result.get("error"))
         
-        return ToolCallResponse(
+        # Fields are already typed (request model, registry result); FastAPI
+        # validates against the response model once when serializing
+        return ToolCallResponse.model_construct(
             success=True,
             server=request.server,
             tool=request.tool,
@@ -116,6 +106,7 @@ async def call_tool(
 async def check_server_health(
     server_name: str,
     db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
 ):
     """
     Check health status of an MCP server.
@@ -123,14 +114,14 @@ async def check_server_health(
     Args:
         server_name: Name of the MCP server
         db: Database session
+        mcp_registry: MCP registry (injected)
         
     Returns:
         Health status
     """
     try:
-        logger.info("🏥 Checking MCP server health", server=server_name)
+        logger.debug("🏥 Checking MCP server health", server=server_name)
         
-        mcp_registry = get_mcp_registry()
         health = await mcp_registry.health_check(server_name, db)
         
         return {
@@ -147,54 +138,71 @@ async def check_server_health(
 @router.post("/reload")
 async def reload_mcps(
     mcp_name: Optional[str] = None,
+    server_names: Optional[List[str]] = Query(None, description="Reload several MCPs by name"),
     db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
+    mcp_repo: MCPServerRepository = Depends(get_mcp_repo),
 ):
     """
     Manually trigger MCP reload from database.
     
     Args:
         mcp_name: Optional - reload specific MCP, or all if not provided
+        server_names: Optional - reload these MCPs (fetched in one query)
         db: Database session
+        mcp_registry: MCP registry (injected)
+        mcp_repo: MCP server rows for this request (injected)
         
     Returns:
         Reload status and loaded MCPs
     """
     try:
-        if mcp_name:
-            logger.info("🔄 Manual reload triggered", mcp=mcp_name)
-            
-            from sqlalchemy import select
-            from app.models import MCPServer
+        if mcp_name or server_names:
+            names = list(dict.fromkeys(([mcp_name] if mcp_name else []) + (server_names or [])))
+            logger.info("🔄 Manual reload triggered", mcps=names)
             
-            result = await db.execute(
-                select(MCPServer).where(MCPServer.name == mcp_name)
-            )
-            mcp = result.scalar_one_or_none()
-            
-            if not mcp:
-                raise HTTPException(status_code=404, detail=f"MCP '{mcp_name}' not found")
+            mcps = await mcp_repo.get_by_names(names)
             
-            mcp_registry = get_mcp_registry()
+            missing = [name for name in names if name not in mcps]
+            if missing:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"MCP '{missing[0]}' not found" if len(missing) == 1
+                    else f"MCPs not found: {', '.join(missing)}",
+                )
             
-            # Unload if exists
-            if mcp_name in mcp_registry.get_loaded_mcps():
-                await mcp_registry.unload_mcp(mcp_name, db)
-            
-            # Reload
-            if mcp.status == 'active':
-                await mcp_registry.load_mcp(mcp, db)
+            # One after another: load/unload write through the shared session
+            loaded = set(mcp_registry.get_loaded_mcps())
+            for name in names:
+                mcp = mcps[name]
+                
+                # Unload if exists
+                if name in loaded:
+                    await mcp_registry.unload_mcp(name, db)
+                
+                # Reload
+                if mcp.status == 'active':
+                    await mcp_registry.load_mcp(mcp, db)
+            _servers_cache.clear()
             
+            if mcp_name and not server_names:
+                return {
+                    "success": True,
+                    "message": f"MCP '{mcp_name}' reloaded",
+                    "mcp": mcp_name,
+                    "status": mcps[mcp_name].health_status,
+                }
             return {
                 "success": True,
-                "message": f"MCP '{mcp_name}' reloaded",
-                "mcp": mcp_name,
-                "status": mcp.health_status,
+                "message": f"{len(names)} MCPs reloaded",
+                "mcps": names,
+                "statuses": {name: mcps[name].health_status for name in names},
             }
         else:
             logger.info("🔄 Manual reload all MCPs triggered")
             
-            mcp_registry = get_mcp_registry()
             await mcp_registry.reload_if_changed(db)
+            _servers_cache.clear()
             
             loaded_mcps = mcp_registry.get_loaded_mcps()
             
@@ -208,78 +216,91 @@ async def reload_mcps(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error("❌ Manual reload failed", mcp=mcp_name, error=str(e))
+        logger.error("❌ Manual reload failed", mcp=mcp_name, mcps=server_names, error=str(e))
         raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
 
 
-@router.get("/servers")
+@router.get("/servers", response_class=ORJSONResponse)
 async def list_mcp_servers(
     enabled_only: bool = False,
     include_health: bool = False,
     db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
+    mcp_repo: MCPServerRepository = Depends(get_mcp_repo),
 ):
     """
     List all configured MCP servers from database.
+    
+    Without include_health the response is cached for SERVERS_CACHE_TTL
+    seconds; health probes always run live.
     """
+    if not include_health:
+        cached = _servers_cache.get(enabled_only)
+        if cached is not None and time.monotonic() - cached["timestamp"] < SERVERS_CACHE_TTL:
+            return cached["data"]
+    
     try:
-        from sqlalchemy import select
-        from app.models import MCPServer
-        
-        logger.info("📋 Listing MCP servers from database", enabled_only=enabled_only)
+        logger.debug("📋 Listing MCP servers from database", enabled_only=enabled_only)
         
-        query = select(MCPServer)
-        if enabled_only:
-            query = query.where(MCPServer.status == 'active')
+        mcps = await (mcp_repo.list_active() if enabled_only else mcp_repo.list_all())
         
-        result = await db.execute(query)
-        mcps = result.scalars().all()
-        
-        mcp_registry = get_mcp_registry()
         servers = []
+        enabled_count = 0
+        
+        # Probe all active servers at once rather than one after another
+        health_by_name = {}
+        if include_health:
+            health_by_name = await mcp_registry.health_check_all(
+                db,
+                names=[mcp.name for mcp in mcps if mcp.status == 'active'],
+                concurrency=SERVERS_HEALTH_CONCURRENCY,
+            )
         
         for mcp in mcps:
+            enabled = mcp.status == 'active'
+            enabled_count += enabled
             server_info = {
                 "name": mcp.name,
                 "url": mcp.url,
                 "protocol": mcp.protocol,
-                "enabled": mcp.status == 'active',
+                "enabled": enabled,
                 "description": mcp.description,
                 "timeout_seconds": mcp.timeout_seconds,
                 "health_status": mcp.health_status,
-                "last_health_check": mcp.last_health_check.isoformat() if mcp.last_health_check else None,
+                "last_health_check": mcp.last_health_check,
             }
             
-            if include_health and mcp.status == 'active':
-                try:
-                    health = await mcp_registry.health_check(mcp.name, db)
-                    server_info["health"] = health
-                except:
-                    pass
+            if mcp.name in health_by_name:
+                server_info["health"] = health_by_name[mcp.name]
             
             servers.append(server_info)
         
-        return {
+        response = {
             "success": True,
             "data": {
                 "servers": servers,
                 "summary": {
                     "total": len(servers),
-                    "enabled": sum(1 for s in servers if s["enabled"]),
-                    "disabled": sum(1 for s in servers if not s["enabled"]),
+                    "enabled": enabled_count,
+                    "disabled": len(servers) - enabled_count,
                 }
             }
         }
+        if not include_health:
+            _servers_cache[enabled_only] = {"data": response, "timestamp": time.monotonic()}
+        return response
         
     except Exception as e:
         logger.error("❌ Failed to list MCP servers", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to list servers: {str(e)}")
 
 
-@router.get("/mcps/{mcp_name}/tools")
+@router.get("/mcps/{mcp_name}/tools", response_class=ORJSONResponse)
 async def get_mcp_tools_for_user(
     mcp_name: str,
     user_email: str,
-    db: AsyncSession = Depends(get_db),
+    mcp_registry: MCPRegistry = Depends(get_mcp_registry),
+    user_service: UserService = Depends(get_user_service),
 ):
     """
     Get tools available for a specific MCP server filtered by user permissions.
@@ -287,37 +308,32 @@ async def get_mcp_tools_for_user(
     Args:
         mcp_name: Name of the MCP server
         user_email: User's email address
-        db: Database session
+        mcp_registry: MCP registry (injected)
+        user_service: User service (injected)
         
     Returns:
         Dict with MCP info and filtered tools list
     """
     try:
-        from app.services.user_service import get_user_service
-        
-        logger.info("🔍 Getting MCP tools for user", mcp_name=mcp_name, user_email=user_email)
+        logger.debug("🔍 Getting MCP tools for user", mcp_name=mcp_name, user_email=user_email)
         
-        mcp_registry = get_mcp_registry()
         all_tools = mcp_registry.get_tools(mcp_name)
         
         if mcp_name not in all_tools:
             raise HTTPException(status_code=404, detail=f"MCP server '{mcp_name}' not found")
         
-        all_tool_names = [tool["name"] for tool in all_tools[mcp_name]]
+        tools = all_tools[mcp_name]
+        all_tool_names = [tool["name"] for tool in tools]
         
-        # Filter tools by user permissions
-        user_service = get_user_service()
-        allowed_tools = await user_service.get_user_allowed_tools(
+        # Filter tools by user permissions (set: O(1) membership per tool)
+        allowed_tools = set(await user_service.get_user_allowed_tools(
             user_id=user_email,
             mcp_name=mcp_name,
             all_tools=all_tool_names,
-        )
+        ))
         
         # Filter the tool list
-        filtered_tools = [
-            tool for tool in all_tools[mcp_name]
-            if tool["name"] in allowed_tools
-        ]
+        filtered_tools = [tool for tool in tools if tool["name"] in allowed_tools]
         
         logger.info(
             "✅ Filtered tools for user",
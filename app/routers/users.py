@@ -4,18 +4,215 @@ User Management Endpoints
 Provides user information, roles, and permissions
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 
+import orjson
+
+from app.config import settings
+from app.services.cache_invalidation import register_invalidation_handler
 from app.services.user_service import UserService, get_user_service
 from app.utils.logger import logger
+from app.utils.metrics import USERS_CACHE, USERS_LATENCY, observe_latency
 
 
 router = APIRouter()
 
+# Rendered responses, reused for polling clients (Slack bot, dashboards).
+# Stored as serialized JSON so cache hits skip encoding entirely.
+# Per user: email -> {"body", "etag", "timestamp"}; the list is a single entry.
+USERS_CACHE_TTL = 15
+# Expired entries are kept and served (X-Cache: STALE) when a lookup fails,
+# up to this age, if settings.app.cache_fallback_enabled
+USERS_STALE_TTL = 3600
+# Lets browsers/proxies in front of the API reuse GET responses for as long
+# as we would (private: responses describe specific users). Clients may thus
+# see permission changes up to max-age + stale-while-revalidate seconds late.
+USERS_CACHE_CONTROL = f"private, max-age={USERS_CACHE_TTL}, stale-while-revalidate={2 * USERS_CACHE_TTL}"
+# Per-user entries kept at most; the key comes from the request (path or
+# batch body), so unknown emails must not grow the cache without limit
+USERS_CACHE_MAX_ENTRIES = 4096
+# Insertion-ordered (re-inserted on store), so the oldest entries come first
+_user_info_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_users_list_cache: Optional[Dict[str, Any]] = None
+
+# POST /users:batch resolves uncached users at most this many at a time
+USERS_BATCH_CONCURRENCY = 8
+
+# Startup warm-up of the per-user cache for users listed in users.yaml
+USERS_WARM_CONCURRENCY = 32
+
+
+class UsersBatchRequest(BaseModel):
+    emails: List[str] = Field(..., max_length=500)
+
+
+def _normalize_email(email: str) -> str:
+    """Canonical form of an email, used as the cache and lookup key."""
+    return email.strip().lower()
+
+
+def invalidate_users_cache(email: Optional[str] = None) -> None:
+    """Drop cached /users responses (one user, or all)."""
+    global _users_list_cache
+    if email:
+        _user_info_cache.pop(_normalize_email(email), None)
+    else:
+        _user_info_cache.clear()
+    _users_list_cache = None
+
+
+@register_invalidation_handler
+def _on_cache_invalidation(user_id: Optional[str]) -> None:
+    """Drop all cached responses (they are keyed by email, not user_id)."""
+    invalidate_users_cache()
+
+
+def _store_user_info(email: str, entry: Dict[str, Any]) -> None:
+    """Cache a per-user entry, dropping entries past USERS_STALE_TTL and the oldest when full."""
+    _user_info_cache.pop(email, None)
+    _user_info_cache[email] = entry
+    cutoff = entry["timestamp"] - USERS_STALE_TTL
+    while _user_info_cache:
+        oldest = next(iter(_user_info_cache.values()))
+        if oldest["timestamp"] > cutoff and len(_user_info_cache) <= USERS_CACHE_MAX_ENTRIES:
+            break
+        _user_info_cache.popitem(last=False)
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _cache_entry(data: Dict) -> Dict[str, Any]:
+    """Cache entry for a rendered response: JSON body and its strong ETag."""
+    body = orjson.dumps(data)
+    return {"body": body, "etag": _etag(body), "timestamp": time.monotonic()}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _conditional_response(
+    request: Request,
+    entry: Dict[str, Any],
+    cache_control: Optional[str] = USERS_CACHE_CONTROL,
+) -> Response:
+    """304 if the client already has this entry, else its body (ETag set)."""
+    headers = {"ETag": entry["etag"]}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def _stale_entry(cached: Optional[Dict[str, Any]], endpoint: str) -> Optional[Dict[str, Any]]:
+    """Expired cache entry still usable after a failed lookup, or None."""
+    if not settings.app.cache_fallback_enabled or cached is None:
+        return None
+    if time.monotonic() - cached["timestamp"] >= USERS_STALE_TTL:
+        return None
+    USERS_CACHE.labels(endpoint, "stale").inc()
+    return cached
+
+
+def _stale_fallback(cached: Optional[Dict[str, Any]], endpoint: str) -> Optional[Response]:
+    """Expired cache entry to serve after a failed lookup, or None."""
+    cached = _stale_entry(cached, endpoint)
+    if cached is None:
+        return None
+    return Response(
+        content=cached["body"],
+        media_type="application/json",
+        headers={"X-Cache": "STALE", "Warning": '110 - "Response is Stale"'},
+    )
+
+
+async def _user_info_entry(email: str, user_service: UserService, endpoint: str) -> Dict[str, Any]:
+    """Cache entry for one (normalized) email, looked up if missing or expired."""
+    cached = _user_info_cache.get(email)
+    if cached is not None and time.monotonic() - cached["timestamp"] < USERS_CACHE_TTL:
+        USERS_CACHE.labels(endpoint, "hit").inc()
+        return cached
+    
+    USERS_CACHE.labels(endpoint, "miss").inc()
+    # User config and allowed MCPs from one lookup
+    user_config, allowed_mcps = await user_service.get_user_with_mcps(email)
+    
+    user_info = {
+        "email": email,
+        "name": user_config.get("name", email.partition("@")[0]),
+        "role": user_config.get("role", "read_only"),
+        "allowed_mcps": allowed_mcps,
+        "allowed_domains": user_config.get("allowed_domains", []),
+        "allowed_databases": user_config.get("allowed_databases", []),
+        "teams": user_config.get("teams", []),
+        "slack_user_id": user_config.get("slack_user_id"),
+        "allow_all_mcps": user_config.get("allow_all_mcps", False),
+        "is_default": user_config.get("is_default", False),
+    }
+    entry = _cache_entry(user_info)
+    _store_user_info(email, entry)
+    return entry
+
+
+async def warm_users_cache(user_service: Optional[UserService] = None) -> int:
+    """
+    Prime the per-user cache for every user configured in users.yaml.
+    
+    Lookups run at most USERS_WARM_CONCURRENCY at a time; failures are
+    logged and skipped (the user is simply looked up on first request).
+    
+    Returns:
+        Number of users cached
+    """
+    user_service = user_service or get_user_service()
+    users_config = settings.users_config
+    emails = list(dict.fromkeys(
+        _normalize_email(entry["email"])
+        for entry in users_config.get("super_admins", []) + users_config.get("users", [])
+        if entry.get("email")
+    ))
+    semaphore = asyncio.Semaphore(USERS_WARM_CONCURRENCY)
+    
+    async def warm(email: str) -> bool:
+        async with semaphore:
+            try:
+                await _user_info_entry(email, user_service, "warmup")
+                return True
+            except Exception as e:
+                logger.warning("Failed to warm user cache", email=email, error=str(e))
+                return False
+    
+    results = await asyncio.gather(*(warm(email) for email in emails))
+    warmed = sum(results)
+    logger.info("✅ User cache warmed", users=warmed, configured=len(emails))
+    return warmed
+
 
 @router.get("/users/{email}")
-async def get_user_info(email: str, user_service: UserService = Depends(get_user_service)) -> Dict:
+@observe_latency(USERS_LATENCY, "user_info")
+async def get_user_info(
+    email: str,
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
     """
     Get user information including role and permissions
     
@@ -30,55 +227,122 @@ async def get_user_info(email: str, user_service: UserService = Depends(get_user
         - allowed_mcps: List of allowed MCP servers or "*" for all
         - allowed_domains: List of allowed domains
         - permissions: Additional permissions
+    
+    Responses are cached per email for USERS_CACHE_TTL seconds and carry an
+    ETag; a matching If-None-Match gets 304. If the lookup fails, an older
+    cached response is served with X-Cache: STALE.
+    
+    The email is matched case-insensitively (trimmed and lowercased).
     """
+    email = _normalize_email(email)
+    cached = _user_info_cache.get(email)
     try:
-        # Get user config from users.yaml
-        user_config = await user_service.get_user(email)
-        
-        # Get allowed MCPs
-        allowed_mcps = await user_service.get_allowed_mcps(email)
-        
-        return {
-            "email": email,
-            "name": user_config.get("name", email.split("@")[0]),
-            "role": user_config.get("role", "read_only"),
-            "allowed_mcps": allowed_mcps,
-            "allowed_domains": user_config.get("allowed_domains", []),
-            "allowed_databases": user_config.get("allowed_databases", []),
-            "teams": user_config.get("teams", []),
-            "slack_user_id": user_config.get("slack_user_id"),
-            "allow_all_mcps": user_config.get("allow_all_mcps", False),
-            "is_default": user_config.get("is_default", False),
-        }
+        entry = await _user_info_entry(email, user_service, "user_info")
+        return _conditional_response(request, entry)
         
     except Exception as e:
         logger.error("Failed to get user info", email=email, error=str(e))
+        stale = _stale_fallback(cached, "user_info")
+        if stale is not None:
+            return stale
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve user info: {str(e)}"
         )
 
 
+@router.post("/users:batch")
+@observe_latency(USERS_LATENCY, "users_batch")
+async def get_users_batch(
+    batch: UsersBatchRequest,
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    """
+    Get user information for several users in one request
+    
+    Args:
+        batch: Emails to look up (duplicates, including case variants, are
+            resolved once)
+        
+    Returns:
+        Dict of requested email -> user info, in the same shape as
+        GET /users/{email}
+    
+    Shares the per-user cache with GET /users/{email}; the combined body is
+    assembled from the cached JSON and carries an ETag for If-None-Match.
+    """
+    requested = {email: _normalize_email(email) for email in batch.emails}
+    emails = list(dict.fromkeys(requested.values()))
+    semaphore = asyncio.Semaphore(USERS_BATCH_CONCURRENCY)
+    
+    async def resolve(email: str) -> Dict[str, Any]:
+        cached = _user_info_cache.get(email)
+        try:
+            async with semaphore:
+                return await _user_info_entry(email, user_service, "users_batch")
+        except Exception as e:
+            logger.error("Failed to get user info", email=email, error=str(e))
+            stale = _stale_entry(cached, "users_batch")
+            if stale is None:
+                raise
+            return stale
+    
+    try:
+        entries = await asyncio.gather(*(resolve(email) for email in emails))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve user info: {str(e)}"
+        )
+    
+    by_email = dict(zip(emails, entries))
+    body = b"{" + b",".join(
+        orjson.dumps(email) + b":" + by_email[normalized]["body"]
+        for email, normalized in requested.items()
+    ) + b"}"
+    # POST: ETag for revalidation only, no freshness headers
+    return _conditional_response(request, {"body": body, "etag": _etag(body)}, cache_control=None)
+
+
 @router.get("/users")
-async def list_users(user_service: UserService = Depends(get_user_service)) -> Dict:
+@observe_latency(USERS_LATENCY, "users_list")
+async def list_users(
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
     """
     List all configured users
     
     Returns:
-        Dict with users list and statistics
+        Dict with users list and statistics (cached for USERS_CACHE_TTL seconds
+        with an ETag for conditional requests; served stale with
+        X-Cache: STALE if listing fails)
     """
+    global _users_list_cache
+    cached = _users_list_cache
+    if cached is not None and time.monotonic() - cached["timestamp"] < USERS_CACHE_TTL:
+        USERS_CACHE.labels("users_list", "hit").inc()
+        return _conditional_response(request, cached)
+    
+    USERS_CACHE.labels("users_list", "miss").inc()
     try:
         users_list = await user_service.list_users()
-        super_admins = [u for u in users_list if u.get("is_super_admin")]
-        return {
+        super_admins = sum(1 for u in users_list if u.is_super_admin)
+        users_response = {
             "total_users": len(users_list),
-            "super_admins": len(super_admins),
-            "regular_users": len(users_list) - len(super_admins),
+            "super_admins": super_admins,
+            "regular_users": len(users_list) - super_admins,
             "users": users_list,
         }
+        _users_list_cache = _cache_entry(users_response)
+        return _conditional_response(request, _users_list_cache)
         
     except Exception as e:
         logger.error("Failed to list users", error=str(e))
+        stale = _stale_fallback(cached, "users_list")
+        if stale is not None:
+            return stale
         raise HTTPException(
             status_code=500,
             detail=f"Failed to list users: {str(e)}"
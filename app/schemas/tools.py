@@ -0,0 +1,27 @@
+"""
+MCP Tool Schemas
+
+Request/response models for the MCP tools endpoints.
+"""
+
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ToolCallRequest(BaseModel):
+    """Request model for calling an MCP tool."""
+    
+    server: str = Field(..., description="MCP server name")
+    tool: str = Field(..., description="Tool name to execute")
+    arguments: Dict[str, Any] = Field(default={}, description="Tool arguments")
+
+
+class ToolCallResponse(BaseModel):
+    """Response model for tool execution."""
+    
+    success: bool
+    server: str
+    tool: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
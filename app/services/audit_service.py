@@ -6,22 +6,179 @@ Handles logging of all user interactions, tool calls, and system events.
 
 import time
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import text
+
+from app import database
 from app.utils.logger import logger
 
 
+# Optional get_logs() filters: (parameter name, WHERE fragment), in query order
+_LOG_FILTER_CLAUSES = (
+    ("user_id", " AND a.user_id = (SELECT id FROM users WHERE email = :user_id)"),
+    ("status", " AND a.status = :status"),
+    # Containment (not "= ANY") so idx_audit_logs_mcps_accessed (GIN) applies
+    ("mcp_name", " AND a.mcps_accessed @> ARRAY[CAST(:mcp_name AS TEXT)]"),
+    ("start_date", " AND a.created_at >= :start_date"),
+    ("end_date", " AND a.created_at <= :end_date"),
+)
+
+# Auto-creates the requesting user (name taken from the email local part) and
+# resolves their id within the audit INSERT statement. The inserted row is not
+# visible to other parts of the same statement, so the new id comes from
+# RETURNING and an existing one from the users lookup.
+_AUDIT_USER_CTE = """
+    WITH inserted_user AS (
+        INSERT INTO users (email, name, is_super_admin, created_at)
+        VALUES (:user_id, SPLIT_PART(:email_for_name, '@', 1), false, NOW())
+        ON CONFLICT (email) DO NOTHING
+        RETURNING id
+    ),
+    audit_user AS (
+        SELECT id FROM inserted_user
+        UNION ALL
+        SELECT id FROM users WHERE email = :user_id
+    )
+"""
+
+# Folds per-status partial sums ("parts") into the get_stats() result. The
+# parts are grouped by status first, so the status filters here only see a
+# handful of rows. Aggregates are cast so rows decode straight to ints/floats
+# rather than Decimal objects.
+_STATS_TOTALS = """
+    SELECT
+        COALESCE(SUM(requests), 0)::bigint AS total_requests,
+        COALESCE(SUM(tool_calls), 0)::bigint AS total_tool_calls,
+        COALESCE(SUM(iterations_sum) / NULLIF(SUM(iterations_n), 0), 0)::float8 AS avg_iterations,
+        COALESCE(SUM(duration_sum) / NULLIF(SUM(duration_n), 0), 0)::float8 AS avg_duration_ms,
+        COALESCE(SUM(cost), 0)::float8 AS total_cost,
+        COALESCE(SUM(requests) FILTER (WHERE status = 'error'), 0)::bigint AS error_count,
+        COALESCE(SUM(requests) FILTER (WHERE status = 'success'), 0)::bigint AS success_count,
+        COALESCE(SUM(requests) FILTER (WHERE status = 'warning'), 0)::bigint AS warning_count
+    FROM parts
+"""
+
+# get_stats() over raw audit_logs rows
+_STATS_RAW_QUERY = """
+    WITH parts AS (
+        SELECT
+            a.status,
+            COUNT(*) AS requests,
+            SUM(a.tool_calls_count) AS tool_calls,
+            SUM(a.iterations) AS iterations_sum,
+            COUNT(a.iterations) AS iterations_n,
+            SUM(a.duration_ms) AS duration_sum,
+            COUNT(a.duration_ms) AS duration_n,
+            SUM(a.cost_estimate) AS cost
+        FROM audit_logs a
+        WHERE a.created_at >= :since {user_filter}
+        GROUP BY a.status
+    )
+""" + _STATS_TOTALS
+
+# get_stats() combining audit_logs_daily_mv (complete days up to the last
+# refresh) with raw rows for the partial first day and everything after the
+# rollup ends. Both halves produce the same per-status partial sums.
+_STATS_ROLLUP_QUERY = """
+    WITH rollup_end AS (
+        SELECT GREATEST(
+            COALESCE(MAX(day) + INTERVAL '1 day', :first_full_day), :first_full_day
+        ) AS ts
+        FROM audit_logs_daily_mv
+    ),
+    parts AS (
+        SELECT
+            m.status,
+            SUM(m.requests) AS requests,
+            SUM(m.tool_calls) AS tool_calls,
+            SUM(m.iterations_sum) AS iterations_sum,
+            SUM(m.iterations_n) AS iterations_n,
+            SUM(m.duration_sum) AS duration_sum,
+            SUM(m.duration_n) AS duration_n,
+            SUM(m.cost) AS cost
+        FROM audit_logs_daily_mv m, rollup_end e
+        WHERE m.day >= :first_full_day AND m.day < e.ts {mv_user_filter}
+        GROUP BY m.status
+        UNION ALL
+        SELECT
+            a.status,
+            COUNT(*),
+            SUM(a.tool_calls_count),
+            SUM(a.iterations),
+            COUNT(a.iterations),
+            SUM(a.duration_ms),
+            COUNT(a.duration_ms),
+            SUM(a.cost_estimate)
+        FROM audit_logs a, rollup_end e
+        WHERE a.created_at >= :since
+          AND (a.created_at < :first_full_day OR a.created_at >= e.ts) {user_filter}
+        GROUP BY a.status
+    )
+""" + _STATS_TOTALS
+
+_STATS_USER_FILTER = "AND {alias}.user_id = (SELECT id FROM users WHERE email = :user_id)"
+
+_STATS_RAW_QUERIES = {
+    False: _STATS_RAW_QUERY.format(user_filter=""),
+    True: _STATS_RAW_QUERY.format(user_filter=_STATS_USER_FILTER.format(alias="a")),
+}
+_STATS_ROLLUP_QUERIES = {
+    False: _STATS_ROLLUP_QUERY.format(mv_user_filter="", user_filter=""),
+    True: _STATS_ROLLUP_QUERY.format(
+        mv_user_filter=_STATS_USER_FILTER.format(alias="m"),
+        user_filter=_STATS_USER_FILTER.format(alias="a"),
+    ),
+}
+
+
+# SQLSTATE undefined_table: raised by rollup queries when migration 005
+# (audit_logs_daily_mv) is not applied
+_UNDEFINED_TABLE = "42P01"
+
+
+def _is_missing_rollup(error: Exception) -> bool:
+    """Whether a rollup query failed because audit_logs_daily_mv does not exist."""
+    # SQLAlchemy wraps the driver error (.orig), which wraps asyncpg's (__cause__)
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if getattr(error, "sqlstate", None) == _UNDEFINED_TABLE:
+            return True
+        error = getattr(error, "orig", None) or error.__cause__
+    return False
+
+
 class AuditService:
     """Service for audit logging to PostgreSQL."""
     
+    # Aggregate stats are cached briefly; they are re-read often (dashboards,
+    # repeated LLM tool calls) but only drift by a few requests per minute
+    STATS_CACHE_TTL = 60
+    STATS_CACHE_MAX_ENTRIES = 256
+    
+    # Seconds to wait before retrying a failed daily rollup refresh
+    DAILY_ROLLUP_RETRY_SECONDS = 900
+    
+    # get_logs() bounds: callers cannot pull an unbounded page, and status
+    # filters outside the values log_chat_request() writes match nothing
+    LOGS_MAX_LIMIT = 1000
+    LOG_STATUSES = frozenset({"success", "error", "warning"})
+    
     def __init__(self):
         """Initialize audit service."""
-        pass
+        self._stats_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._stats_cache_hits = 0
+        self._stats_cache_misses = 0
+        # Cleared while the rollup view (migration 005) is not installed;
+        # refresh_daily_rollup() re-probes it and sets it again
+        self._daily_rollup_available = True
+        # time.monotonic() before which a failed rollup refresh is not retried
+        self._daily_rollup_retry_at = 0.0
     
     def _get_engine(self):
-        """Get the database engine, checking if it's initialized."""
-        from app.database import engine
-        return engine
+        """Get the database engine (None until init_db() has run)."""
+        return database.engine
     
     async def log_chat_request(
         self,
@@ -91,22 +248,10 @@ class AuditService:
                 return -1
             
             # Use SQLAlchemy engine for raw SQL
-            from sqlalchemy import text
             async with engine.begin() as conn:
-                # Auto-create user if doesn't exist (upsert pattern)
-                # Extract name from email (before @)
-                await conn.execute(
-                    text("""
-                        INSERT INTO users (email, name, is_super_admin, created_at)
-                        VALUES (:email, SPLIT_PART(:email_for_name, '@', 1), false, NOW())
-                        ON CONFLICT (email) DO NOTHING
-                    """),
-                    {"email": user_id, "email_for_name": user_id}
-                )
-                
-                # Now insert audit log
+                # User upsert and audit insert in a single round trip
                 result_row = await conn.execute(
-                    text("""
+                    text(_AUDIT_USER_CTE + """
                         INSERT INTO audit_logs (
                             user_id,
                             request_type,
@@ -133,7 +278,7 @@ class AuditService:
                             success,
                             created_at
                         ) VALUES (
-                            (SELECT id FROM users WHERE email = :user_id),
+                            (SELECT id FROM audit_user LIMIT 1),
                             :request_type, :message, :message_preview, :iterations,
                             :tool_calls_count, :tools_used, :mcps_accessed, :duration_ms,
                             :tokens_input, :tokens_output, :tokens_cached, :cost_estimate,
@@ -144,6 +289,7 @@ class AuditService:
                     """),
                     {
                         "user_id": user_id,
+                        "email_for_name": user_id,
                         "request_type": "chat",
                         "message": message,
                         "message_preview": message_preview,
@@ -225,21 +371,10 @@ class AuditService:
                 return -1
             
             # Use SQLAlchemy engine for raw SQL
-            from sqlalchemy import text
             async with engine.begin() as conn:
-                # Auto-create user if doesn't exist
-                await conn.execute(
-                    text("""
-                        INSERT INTO users (email, name, is_super_admin, created_at)
-                        VALUES (:email, SPLIT_PART(:email_for_name, '@', 1), false, NOW())
-                        ON CONFLICT (email) DO NOTHING
-                    """),
-                    {"email": user_id, "email_for_name": user_id}
-                )
-                
-                # Insert error audit log
+                # User upsert and error audit insert in a single round trip
                 result_row = await conn.execute(
-                    text("""
+                    text(_AUDIT_USER_CTE + """
                         INSERT INTO audit_logs (
                             user_id,
                             request_type,
@@ -256,7 +391,7 @@ class AuditService:
                             success,
                             created_at
                         ) VALUES (
-                            (SELECT id FROM users WHERE email = :user_id),
+                            (SELECT id FROM audit_user LIMIT 1),
                             :request_type, :message, :message_preview, :iterations,
                             :tool_calls_count, :duration_ms, :status, :error_message,
                             :response_preview, :ip_address, :user_agent, :success, NOW()
@@ -264,6 +399,7 @@ class AuditService:
                     """),
                     {
                         "user_id": user_id,
+                        "email_for_name": user_id,
                         "request_type": "chat",
                         "message": message,
                         "message_preview": message_preview,
@@ -347,7 +483,7 @@ class AuditService:
         
         Args:
             user_id: Filter by user email (optional)
-            limit: Maximum number of results
+            limit: Maximum number of results (clamped to 1..LOGS_MAX_LIMIT)
             offset: Pagination offset
             status: Filter by status (success, error, warning)
             mcp_name: Filter by MCP name
@@ -357,6 +493,12 @@ class AuditService:
         Returns:
             List of audit log records
         """
+        limit = max(1, min(int(limit), self.LOGS_MAX_LIMIT))
+        offset = max(0, int(offset))
+        if status and status not in self.LOG_STATUSES:
+            logger.warning("⚠️ Unknown audit status filter", status=status)
+            return []
+        
         try:
             # Check if database is initialized
             engine = self._get_engine()
@@ -364,60 +506,74 @@ class AuditService:
                 logger.warning("⚠️ Database not initialized, returning empty audit logs")
                 return []
             
-            from sqlalchemy import text
-            
-            # Build dynamic query
+            # Build dynamic query: filter and page audit_logs first, then
+            # join users for just the rows being returned
             query_str = """
-                SELECT 
-                    a.id,
-                    u.email as user_email,
-                    a.request_type,
-                    a.message_preview,
-                    a.iterations,
-                    a.tool_calls_count,
-                    a.tools_used,
-                    a.mcps_accessed,
-                    a.duration_ms,
-                    a.cost_estimate,
-                    a.status,
-                    a.warning,
-                    a.created_at
-                FROM audit_logs a
-                LEFT JOIN users u ON a.user_id = u.id
-                WHERE 1=1
+                WITH page AS (
+                    SELECT
+                        a.id,
+                        a.user_id,
+                        a.request_type,
+                        a.message_preview,
+                        a.iterations,
+                        a.tool_calls_count,
+                        a.tools_used,
+                        a.mcps_accessed,
+                        a.duration_ms,
+                        a.cost_estimate,
+                        a.status,
+                        a.warning,
+                        a.created_at
+                    FROM audit_logs a
+                    WHERE 1=1
             """
             
+            filters = {
+                "user_id": user_id,
+                "status": status,
+                "mcp_name": mcp_name,
+                "start_date": start_date,
+                "end_date": end_date,
+            }
             params = {}
             
-            if user_id:
-                query_str += " AND u.email = :user_id"
-                params["user_id"] = user_id
-            
-            if status:
-                query_str += " AND a.status = :status"
-                params["status"] = status
-            
-            if mcp_name:
-                query_str += " AND :mcp_name = ANY(a.mcps_accessed)"
-                params["mcp_name"] = mcp_name
+            for name, clause in _LOG_FILTER_CLAUSES:
+                value = filters[name]
+                if value:
+                    query_str += clause
+                    params[name] = value
             
-            if start_date:
-                query_str += " AND a.created_at >= :start_date"
-                params["start_date"] = start_date
-            
-            if end_date:
-                query_str += " AND a.created_at <= :end_date"
-                params["end_date"] = end_date
-            
-            query_str += " ORDER BY a.created_at DESC LIMIT :limit OFFSET :offset"
+            query_str += """
+                    ORDER BY a.created_at DESC LIMIT :limit OFFSET :offset
+                )
+                SELECT 
+                    p.id,
+                    u.email as user_email,
+                    p.request_type,
+                    p.message_preview,
+                    p.iterations,
+                    p.tool_calls_count,
+                    p.tools_used,
+                    p.mcps_accessed,
+                    p.duration_ms,
+                    p.cost_estimate,
+                    p.status,
+                    p.warning,
+                    p.created_at
+                FROM page p
+                LEFT JOIN users u ON p.user_id = u.id
+                ORDER BY p.created_at DESC
+            """
             params["limit"] = limit
             params["offset"] = offset
             
             async with engine.connect() as conn:
                 result = await conn.execute(text(query_str), params)
+                keys = tuple(result.keys())
                 rows = result.fetchall()
             
-            return [dict(row._mapping) for row in rows]
+            # Column names resolved once for the whole page of rows
+            return [dict(zip(keys, row)) for row in rows]
             
         except Exception as e:
             logger.error("❌ Failed to query audit logs", error=str(e))
@@ -438,6 +594,15 @@ class AuditService:
         Returns:
             Statistics dict
         """
+        cache_key = (user_id, days)
+        cached = self._stats_cache.get(cache_key)
+        if cached:
+            age = time.monotonic() - cached["timestamp"]
+            if age < self.STATS_CACHE_TTL:
+                self._stats_cache_hits += 1
+                return dict(cached["data"])
+        self._stats_cache_misses += 1
+        
         try:
             # Check if database is initialized
             engine = self._get_engine()
@@ -445,39 +610,149 @@ class AuditService:
                 logger.warning("⚠️ Database not initialized, returning empty audit stats")
                 return {}
             
-            from sqlalchemy import text
-            
-            # Build query with days as integer (can't bind in INTERVAL)
-            query_str = f"""
-                SELECT 
-                    COUNT(*) as total_requests,
-                    COALESCE(SUM(tool_calls_count), 0) as total_tool_calls,
-                    COALESCE(AVG(iterations), 0) as avg_iterations,
-                    COALESCE(AVG(duration_ms), 0) as avg_duration_ms,
-                    COALESCE(SUM(cost_estimate), 0) as total_cost,
-                    COUNT(*) FILTER (WHERE status = 'error') as error_count,
-                    COUNT(*) FILTER (WHERE status = 'success') as success_count,
-                    COUNT(*) FILTER (WHERE status = 'warning') as warning_count
-                FROM audit_logs a
-                LEFT JOIN users u ON a.user_id = u.id
-                WHERE a.created_at >= NOW() - INTERVAL '{days} day'
-            """
-            
-            params = {}
-            
+            # The window start is resolved here and bound as a plain timestamp,
+            # so the statement text stays constant and the planner can use the
+            # created_at index directly
+            since = datetime.now(timezone.utc) - timedelta(days=days)
+            params = {"since": since}
             if user_id:
-                query_str += " AND u.email = :user_id"
                 params["user_id"] = user_id
             
-            async with engine.connect() as conn:
-                result = await conn.execute(text(query_str), params)
-                row = result.fetchone()
-            
-            return dict(row._mapping) if row else {}
+            stats = None
+            if self._daily_rollup_available:
+                # Complete days come from the daily rollup; the partial first
+                # day and anything newer than the last refresh from audit_logs
+                first_full_day = since.replace(hour=0, minute=0, second=0, microsecond=0)
+                if first_full_day < since:
+                    first_full_day += timedelta(days=1)
+                try:
+                    async with engine.connect() as conn:
+                        result = await conn.execute(
+                            text(_STATS_ROLLUP_QUERIES[bool(user_id)]),
+                            {**params, "first_full_day": first_full_day},
+                        )
+                        row = result.fetchone()
+                    stats = dict(row._mapping) if row else {}
+                except Exception as e:
+                    if not _is_missing_rollup(e):
+                        raise
+                    # Migration 005 not applied yet - fall back to raw scans
+                    self._daily_rollup_available = False
+                    logger.warning("⚠️ audit_logs_daily_mv missing, using raw audit stats")
+            
+            if stats is None:
+                async with engine.connect() as conn:
+                    result = await conn.execute(
+                        text(_STATS_RAW_QUERIES[bool(user_id)]), params
+                    )
+                    row = result.fetchone()
+                stats = dict(row._mapping) if row else {}
+            
+            if stats:
+                self._store_stats(cache_key, stats)
+            return stats
             
         except Exception as e:
             logger.error("❌ Failed to get audit stats", error=str(e))
             return {}
+    
+    async def refresh_daily_rollup(self) -> bool:
+        """
+        Refresh the audit_logs_daily_mv rollup used by get_stats().
+        
+        Runs CONCURRENTLY so stats readers are never blocked. The view only
+        holds complete days, so one refresh per UTC day keeps it current.
+        
+        Every worker calls this, so the refresh runs under a transaction-level
+        advisory lock: while one process refreshes the others skip, and a
+        view that already covers yesterday is not refreshed again. After a
+        failure, refreshes are skipped for DAILY_ROLLUP_RETRY_SECONDS; a
+        missing view is re-probed the same way, so applying migration 005
+        later takes effect without a restart.
+        
+        Returns:
+            True if the view is current (refreshed here or by another process)
+        """
+        engine = self._get_engine()
+        if engine is None:
+            return False
+        if time.monotonic() < self._daily_rollup_retry_at:
+            return False
+        
+        try:
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    text("SELECT pg_try_advisory_xact_lock(hashtext('audit_logs_daily_mv'))")
+                )
+                if not result.scalar():
+                    logger.debug("Audit daily rollup refresh running in another process")
+                    return True
+                
+                result = await conn.execute(text(
+                    "SELECT MAX(day) >= date_trunc('day', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+                    " - INTERVAL '1 day' FROM audit_logs_daily_mv"
+                ))
+                self._daily_rollup_available = True  # The view exists
+                if result.scalar():
+                    logger.debug("Audit daily rollup already current")
+                    return True
+                
+                await conn.execute(
+                    text("REFRESH MATERIALIZED VIEW CONCURRENTLY audit_logs_daily_mv")
+                )
+            logger.info("📊 Audit daily rollup refreshed")
+            return True
+        except Exception as e:
+            self._daily_rollup_retry_at = time.monotonic() + self.DAILY_ROLLUP_RETRY_SECONDS
+            if _is_missing_rollup(e):
+                self._daily_rollup_available = False
+                logger.warning("⚠️ audit_logs_daily_mv missing, using raw audit stats")
+                return False
+            logger.warning("⚠️ Failed to refresh audit daily rollup", error=str(e))
+            return False
+    
+    def _store_stats(self, cache_key: tuple, stats: Dict[str, Any]) -> None:
+        """Cache a stats result, dropping expired entries once the cache is full."""
+        now = time.monotonic()
+        if len(self._stats_cache) >= self.STATS_CACHE_MAX_ENTRIES:
+            self._stats_cache = {
+                key: entry
+                for key, entry in self._stats_cache.items()
+                if now - entry["timestamp"] < self.STATS_CACHE_TTL
+            }
+            if len(self._stats_cache) >= self.STATS_CACHE_MAX_ENTRIES:
+                self._stats_cache.clear()
+        self._stats_cache[cache_key] = {"data": dict(stats), "timestamp": now}
+    
+    def clear_stats_cache(self) -> int:
+        """
+        Drop all cached stats results.
+        
+        Returns:
+            Number of entries cleared
+        """
+        count = len(self._stats_cache)
+        self._stats_cache.clear()
+        logger.info("Cleared audit stats cache", entries=count)
+        return count
+    
+    def get_stats_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get stats cache statistics.
+        
+        Returns:
+            Dict with cache size, valid entries, hit/miss counts and TTL
+        """
+        cutoff = time.monotonic() - self.STATS_CACHE_TTL
+        lookups = self._stats_cache_hits + self._stats_cache_misses
+        return {
+            "size": len(self._stats_cache),
+            "valid": sum(1 for entry in self._stats_cache.values() if entry["timestamp"] > cutoff),
+            "hits": self._stats_cache_hits,
+            "misses": self._stats_cache_misses,
+            "hit_rate": round(self._stats_cache_hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.STATS_CACHE_TTL,
+        }
 
 
 # Global audit service instance
@@ -5,9 +5,10 @@ Communicates with auth_service microservice for user authentication and manageme
 Includes in-memory caching with TTL and manual invalidation.
 """
 
+import time
+
 import httpx
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
 from app.utils.logger import logger
 
 # Auth service URL (from environment or default)
@@ -16,9 +17,47 @@ AUTH_SERVICE_URL = "http://localhost:8001"
 # Cache configuration
 CACHE_TTL_SECONDS = 300  # 5 minutes
 
-# In-memory cache: {user_id: {"data": {...}, "cached_at": datetime}}
+# In-memory cache: {user_id: {"data": {...}, "cached_at": float}}
+# cached_at is a time.monotonic() reading: cheap to take and compare, and
+# unaffected by wall-clock adjustments
 _user_cache: Dict[int, Dict[str, Any]] = {}
-_email_cache: Dict[str, Dict[str, Any]] = {}  # {email: {"data": {...}, "cached_at": datetime}}
+_email_cache: Dict[str, Dict[str, Any]] = {}  # {email: {"data": {...}, "cached_at": float}}
+
+# Negative cache: users auth_service answered 404 for, so repeated lookups of
+# unknown ids/emails (typos, bots) skip the HTTP call and the warning log.
+# {user_id or email: cached_at}, oldest first (re-inserted on each 404).
+# Keys come from callers, so the cache is capped at NEGATIVE_CACHE_MAX_ENTRIES.
+NEGATIVE_CACHE_TTL_SECONDS = 60
+NEGATIVE_CACHE_MAX_ENTRIES = 4096
+_missing_cache: Dict[Any, float] = {}
+
+
+def _mark_missing(key: Any) -> None:
+    """Remember a 404 for key; once full, drop expired then the oldest entries."""
+    now = time.monotonic()
+    _missing_cache.pop(key, None)
+    _missing_cache[key] = now
+    if len(_missing_cache) <= NEGATIVE_CACHE_MAX_ENTRIES:
+        return
+    while _missing_cache:
+        oldest = next(iter(_missing_cache))
+        if (
+            now - _missing_cache[oldest] < NEGATIVE_CACHE_TTL_SECONDS
+            and len(_missing_cache) <= NEGATIVE_CACHE_MAX_ENTRIES
+        ):
+            break
+        del _missing_cache[oldest]
+
+
+def _is_known_missing(key: Any) -> bool:
+    """Whether key got a 404 within NEGATIVE_CACHE_TTL_SECONDS."""
+    cached_at = _missing_cache.get(key)
+    if cached_at is None:
+        return False
+    if time.monotonic() - cached_at < NEGATIVE_CACHE_TTL_SECONDS:
+        return True
+    del _missing_cache[key]
+    return False
 
 
 async def get_user(user_id: int, bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
@@ -40,43 +79,48 @@ async def get_user(user_id: int, bypass_cache: bool = False) -> Optional[Dict[st
         # Check cache first (unless bypassed)
         if not bypass_cache and user_id in _user_cache:
             cached = _user_cache[user_id]
-            if datetime.now() - cached["cached_at"] < timedelta(seconds=CACHE_TTL_SECONDS):
-                logger.debug(f"Cache HIT for user {user_id}")
+            if time.monotonic() - cached["cached_at"] < CACHE_TTL_SECONDS:
+                logger.debug("Auth cache HIT", user_id=user_id)
                 return cached["data"]
             else:
                 # Cache expired
-                logger.debug(f"Cache EXPIRED for user {user_id}")
+                logger.debug("Auth cache EXPIRED", user_id=user_id)
                 del _user_cache[user_id]
         
+        if not bypass_cache and _is_known_missing(user_id):
+            return None
+        
         # Cache miss - fetch from auth_service
-        logger.debug(f"Cache MISS for user {user_id} - fetching from auth_service")
+        logger.debug("Auth cache MISS - fetching from auth_service", user_id=user_id)
         async with httpx.AsyncClient(timeout=5.0) as client:
             response = await client.get(f"{AUTH_SERVICE_URL}/auth/users/{user_id}")
             response.raise_for_status()
             user_data = response.json()
             
             # Store in cache
+            cached_at = time.monotonic()
             _user_cache[user_id] = {
                 "data": user_data,
-                "cached_at": datetime.now()
+                "cached_at": cached_at
             }
             
             # Also cache by email if present
             if "email" in user_data:
                 _email_cache[user_data["email"]] = {
                     "data": user_data,
-                    "cached_at": datetime.now()
+                    "cached_at": cached_at
                 }
             
             return user_data
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
-            logger.warning(f"User {user_id} not found in auth_service")
+            logger.warning("User not found in auth_service", user_id=user_id)
+            _mark_missing(user_id)
             return None
-        logger.error(f"Failed to fetch user {user_id}: {e}")
+        logger.error("Failed to fetch user", user_id=user_id, error=str(e))
         return None
     except Exception as e:
-        logger.error(f"Error fetching user {user_id} from auth_service: {e}")
+        logger.error("Error fetching user from auth_service", user_id=user_id, error=str(e))
         return None
 
 
@@ -95,43 +139,48 @@ async def get_user_by_email(email: str, bypass_cache: bool = False) -> Optional[
         # Check cache first (unless bypassed)
         if not bypass_cache and email in _email_cache:
             cached = _email_cache[email]
-            if datetime.now() - cached["cached_at"] < timedelta(seconds=CACHE_TTL_SECONDS):
-                logger.debug(f"Cache HIT for email {email}")
+            if time.monotonic() - cached["cached_at"] < CACHE_TTL_SECONDS:
+                logger.debug("Auth cache HIT", email=email)
                 return cached["data"]
             else:
                 # Cache expired
-                logger.debug(f"Cache EXPIRED for email {email}")
+                logger.debug("Auth cache EXPIRED", email=email)
                 del _email_cache[email]
         
+        if not bypass_cache and _is_known_missing(email):
+            return None
+        
         # Cache miss - fetch from auth_service
-        logger.debug(f"Cache MISS for email {email} - fetching from auth_service")
+        logger.debug("Auth cache MISS - fetching from auth_service", email=email)
         async with httpx.AsyncClient(timeout=5.0) as client:
             response = await client.get(f"{AUTH_SERVICE_URL}/auth/users/by-email/{email}")
             response.raise_for_status()
             user_data = response.json()
             
             # Store in cache
+            cached_at = time.monotonic()
             _email_cache[email] = {
                 "data": user_data,
-                "cached_at": datetime.now()
+                "cached_at": cached_at
             }
             
             # Also cache by user_id if present
             if "id" in user_data:
                 _user_cache[user_data["id"]] = {
                     "data": user_data,
-                    "cached_at": datetime.now()
+                    "cached_at": cached_at
                 }
             
             return user_data
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
-            logger.warning(f"User with email {email} not found in auth_service")
+            logger.warning("User not found in auth_service", email=email)
+            _mark_missing(email)
             return None
-        logger.error(f"Failed to fetch user by email {email}: {e}")
+        logger.error("Failed to fetch user by email", email=email, error=str(e))
         return None
     except Exception as e:
-        logger.error(f"Error fetching user by email from auth_service: {e}")
+        logger.error("Error fetching user by email from auth_service", email=email, error=str(e))
         return None
 
 
@@ -154,7 +203,7 @@ async def validate_token(token: str) -> Optional[Dict[str, Any]]:
             response.raise_for_status()
             return response.json()
     except Exception as e:
-        logger.error(f"Token validation failed: {e}")
+        logger.error("Token validation failed", error=str(e))
         return None
 
 
@@ -183,13 +232,14 @@ async def create_user(username: str, email: str, password: str, role: str = "rea
                 }
             )
             response.raise_for_status()
-            logger.info(f"User created: {email}")
+            _missing_cache.pop(email, None)
+            logger.info("User created", email=email)
             return response.json()
     except httpx.HTTPStatusError as e:
-        logger.error(f"Failed to create user {email}: {e.response.text}")
+        logger.error("Failed to create user", email=email, error=e.response.text)
         return None
     except Exception as e:
-        logger.error(f"Error creating user via auth_service: {e}")
+        logger.error("Error creating user via auth_service", email=email, error=str(e))
         return None
 
 
@@ -211,10 +261,10 @@ async def update_user(user_id: int, updates: Dict[str, Any]) -> Optional[Dict[st
                 json=updates
             )
             response.raise_for_status()
-            logger.info(f"User {user_id} updated")
+            logger.info("User updated", user_id=user_id)
             return response.json()
     except Exception as e:
-        logger.error(f"Error updating user {user_id}: {e}")
+        logger.error("Error updating user", user_id=user_id, error=str(e))
         return None
 
 
@@ -238,7 +288,7 @@ async def list_users(skip: int = 0, limit: int = 100) -> list[Dict[str, Any]]:
             response.raise_for_status()
             return response.json()
     except Exception as e:
-        logger.error(f"Error listing users from auth_service: {e}")
+        logger.error("Error listing users from auth_service", error=str(e))
         return []
 
 
@@ -256,13 +306,16 @@ def invalidate_user_cache(user_id: Optional[int] = None, email: Optional[str] =
     """
     invalidated = {"user_id": [], "email": []}
     
+    _missing_cache.pop(user_id, None)
+    _missing_cache.pop(email, None)
+    
     if user_id is not None:
         if user_id in _user_cache:
             # Get email before deleting
             user_data = _user_cache[user_id]["data"]
             del _user_cache[user_id]
             invalidated["user_id"].append(user_id)
-            logger.info(f"Invalidated cache for user_id {user_id}")
+            logger.info("Invalidated auth cache", user_id=user_id)
             
             # Also invalidate email cache
             if "email" in user_data and user_data["email"] in _email_cache:
@@ -275,7 +328,7 @@ def invalidate_user_cache(user_id: Optional[int] = None, email: Optional[str] =
             user_data = _email_cache[email]["data"]
             del _email_cache[email]
             invalidated["email"].append(email)
-            logger.info(f"Invalidated cache for email {email}")
+            logger.info("Invalidated auth cache", email=email)
             
             # Also invalidate user_id cache
             if "id" in user_data and user_data["id"] in _user_cache:
@@ -297,8 +350,9 @@ def clear_all_cache() -> Dict[str, int]:
     
     _user_cache.clear()
     _email_cache.clear()
+    _missing_cache.clear()
     
-    logger.info(f"Cleared all cache: {user_count} users, {email_count} emails")
+    logger.info("Cleared all auth cache", users=user_count, emails=email_count)
     return {"users_cleared": user_count, "emails_cleared": email_count}
 
 
@@ -309,16 +363,16 @@ def get_cache_stats() -> Dict[str, Any]:
     Returns:
         Dict with cache stats
     """
-    now = datetime.now()
+    cutoff = time.monotonic() - CACHE_TTL_SECONDS
     
     user_cache_valid = sum(
         1 for cached in _user_cache.values()
-        if now - cached["cached_at"] < timedelta(seconds=CACHE_TTL_SECONDS)
+        if cached["cached_at"] > cutoff
     )
     
     email_cache_valid = sum(
         1 for cached in _email_cache.values()
-        if now - cached["cached_at"] < timedelta(seconds=CACHE_TTL_SECONDS)
+        if cached["cached_at"] > cutoff
     )
     
     return {
@@ -326,5 +380,6 @@ def get_cache_stats() -> Dict[str, Any]:
         "user_cache_valid": user_cache_valid,
         "email_cache_size": len(_email_cache),
         "email_cache_valid": email_cache_valid,
+        "missing_cache_size": len(_missing_cache),
         "ttl_seconds": CACHE_TTL_SECONDS
     }
@@ -0,0 +1,105 @@
+"""
+Cache Invalidation Broadcast
+
+Uvicorn runs several workers, each with its own in-process caches (/users
+responses, UserService permissions). Permission writes publish a Postgres
+NOTIFY inside their own transaction, so it is delivered only if the write
+commits; every worker LISTENs on a dedicated connection (outside the
+SQLAlchemy pool) and drops its cached copies.
+"""
+
+import asyncio
+from typing import Callable, List, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.user_service import UserService, get_user_service
+from app.utils.logger import logger
+
+
+# Payload: the changed user_id, or "" for all users
+CACHE_INVALIDATION_CHANNEL = "omni2_users_cache"
+# Seconds between attempts to (re)open the LISTEN connection
+LISTEN_RETRY_SECONDS = 5
+
+# Caches outside UserService (e.g. rendered /users responses), called with
+# the changed user_id (None: all users)
+_handlers: List[Callable[[Optional[str]], None]] = []
+
+
+def register_invalidation_handler(
+    handler: Callable[[Optional[str]], None],
+) -> Callable[[Optional[str]], None]:
+    """Register a cache to clear on every invalidation (usable as a decorator)."""
+    _handlers.append(handler)
+    return handler
+
+
+def invalidate_local_caches(user_service: UserService, user_id: Optional[str] = None) -> None:
+    """Drop this worker's cached permissions and registered caches."""
+    user_service.invalidate_permission_cache(user_id)
+    for handler in _handlers:
+        handler(user_id)
+
+
+async def notify_cache_invalidation(db: AsyncSession, user_id: Optional[str] = None) -> None:
+    """
+    Queue an invalidation for every worker in db's current transaction.
+    
+    Postgres delivers the notification when the transaction commits (and
+    drops it on rollback); it rides on the request's connection, so no
+    extra pool checkout is needed.
+    
+    Kept on the request path on purpose: the cost is one statement on a
+    connection the write already holds, and a fire-and-forget task could
+    not join the write's transaction (it would need its own connection and
+    could notify for a write that later rolls back, or miss one that commits).
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CACHE_INVALIDATION_CHANNEL, "payload": user_id or ""},
+    )
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    """Apply an invalidation broadcast (by any worker, this one included)."""
+    invalidate_local_caches(get_user_service(), payload or None)
+
+
+async def listen_cache_invalidations() -> None:
+    """
+    Apply cache invalidations broadcast by other workers, until cancelled.
+    
+    Holds one dedicated asyncpg connection LISTENing on
+    CACHE_INVALIDATION_CHANNEL; if it drops, the caches are cleared
+    (notifications may have been missed) and the connection is reopened.
+    """
+    db = settings.database
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(
+                host=db.host,
+                port=db.port,
+                user=db.user,
+                password=db.password,
+                database=db.database,
+                ssl=False,
+            )
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: lost.set())
+            await conn.add_listener(CACHE_INVALIDATION_CHANNEL, _on_notification)
+            await lost.wait()
+            logger.warning("Cache invalidation listener connection lost")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Cache invalidation listener failed", error=str(e))
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        invalidate_local_caches(get_user_service())
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
@@ -13,7 +13,7 @@ Features:
 """
 
 from typing import Dict, List, Optional, Any, Union, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import fnmatch
 import time
@@ -422,34 +422,42 @@ class MCPClient:
                 "total_tools": len(tools.get("tools", [])),
             }
         
-        # Query all servers
+        # Query all servers (concurrently: total latency is the slowest server,
+        # not the sum)
         all_tools = {}
         total_count = 0
         
+        names = []
         for name, config in self.servers.items():
             if not config.get("enabled", True):
                 logger.info(f"⏭️  Skipping disabled MCP server", server=name)
                 continue
-                
-            try:
-                tools = await self._fetch_tools_native(name)
-                all_tools[name] = tools
-                total_count += len(tools.get("tools", []))
-            except Exception as e:
+            names.append(name)
+        
+        results = await asyncio.gather(
+            *(self._fetch_tools_native(name) for name in names),
+            return_exceptions=True,
+        )
+        
+        for name, tools in zip(names, results):
+            if isinstance(tools, BaseException):
                 logger.error(
                     "❌ Failed to list tools from MCP server",
                     server=name,
-                    error=str(e),
+                    error=str(tools),
                 )
                 all_tools[name] = {
-                    "error": str(e),
+                    "error": str(tools),
                     "status": "unhealthy",
                 }
+            else:
+                all_tools[name] = tools
+                total_count += len(tools.get("tools", []))
         
         return {
             "servers": all_tools,
             "total_tools": total_count,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     
     async def _fetch_tools_native(self, server_name: str, use_cache: bool = True) -> Dict[str, Any]:
@@ -526,7 +534,7 @@ class MCPClient:
                         "protocol": "mcp",
                     },
                     "status": "healthy",
-                    "last_check": datetime.utcnow().isoformat(),
+                    "last_check": datetime.now(timezone.utc).isoformat(),
                 }
                 
                 # Cache the result
@@ -631,7 +639,7 @@ class MCPClient:
                     "server": server_name,
                     "tool": tool_name,
                     "protocol": protocol,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
                 
                 # Add reconnect notice if we had to retry
@@ -691,7 +699,7 @@ class MCPClient:
             "server": server_name,
             "tool": tool_name,
             "protocol": protocol,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     
     async def health_check(self, server_name: str) -> Dict[str, Any]:
@@ -730,7 +738,7 @@ class MCPClient:
                 "healthy": True,
                 "protocol": protocol,
                 "tool_count": tool_count,
-                "last_check": datetime.utcnow().isoformat(),
+                "last_check": datetime.now(timezone.utc).isoformat(),
             }
             
         except Exception as e:
@@ -743,7 +751,7 @@ class MCPClient:
                 "healthy": False,
                 "protocol": protocol,
                 "error": str(e),
-                "last_check": datetime.utcnow().isoformat(),
+                "last_check": datetime.now(timezone.utc).isoformat(),
             }
     
     def invalidate_cache(self, server_name: Optional[str] = None):
@@ -12,7 +12,7 @@ Features:
 """
 
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import time
 import httpx
@@ -30,6 +30,9 @@ from app.services.circuit_breaker import get_circuit_breaker
 # Connection max age (10 minutes)
 CONNECTION_MAX_AGE_SECONDS = 600
 
+# Max MCPs probed at once by health_check_all()
+HEALTH_CHECK_CONCURRENCY = 16
+
 
 class BearerAuth(httpx.Auth):
     """Bearer token authentication for httpx."""
@@ -62,9 +65,9 @@ class MCPRegistry:
         )
         mcps = result.scalars().all()
         
-        logger.info(f"📦 Loading {len(mcps)} active MCPs from database")
+        logger.info("📦 Loading active MCPs from database", count=len(mcps))
         for mcp in mcps:
-            logger.debug(f"  - {mcp.name}: {mcp.url} ({mcp.protocol})")
+            logger.debug("  - MCP", server=mcp.name, url=mcp.url, protocol=mcp.protocol)
         
         for mcp in mcps:
             await self.load_mcp(mcp, db)
@@ -77,33 +80,38 @@ class MCPRegistry:
         
         for attempt in range(1, max_retries + 1):
             try:
-                logger.debug(f"🔌 Attempt {attempt}/{max_retries}: Connecting to {mcp.name}")
-                logger.debug(f"  URL: {mcp.url}")
-                logger.debug(f"  Protocol: {mcp.protocol}")
-                logger.debug(f"  Auth: {mcp.auth_type}")
-                logger.debug(f"  Timeout: {mcp.timeout_seconds}s")
+                logger.debug(
+                    "🔌 Connecting to MCP",
+                    server=mcp.name,
+                    attempt=attempt,
+                    max_retries=max_retries,
+                    url=mcp.url,
+                    protocol=mcp.protocol,
+                    auth=mcp.auth_type,
+                    timeout_seconds=mcp.timeout_seconds,
+                )
                 
                 # Build authentication
                 auth = None
                 if mcp.auth_type and mcp.auth_config:
-                    logger.debug(f"  🔐 Setting up {mcp.auth_type} authentication")
+                    logger.debug("  🔐 Setting up authentication", auth=mcp.auth_type)
                     if mcp.auth_type == 'bearer':
                         token = mcp.auth_config.get('token') or mcp.auth_config.get('api_key')
                         if token:
                             auth = BearerAuth(token)
-                            logger.debug(f"  ✅ Bearer token configured (length: {len(token)})")
+                            logger.debug("  ✅ Bearer token configured", token_length=len(token))
                         else:
-                            logger.warning(f"  ⚠️ Bearer auth configured but no token found")
+                            logger.warning("  ⚠️ Bearer auth configured but no token found")
                 
                 # Normalize URL
                 url = mcp.url.rstrip('/')
                 if not url.endswith('/mcp'):
                     url = f"{url}/mcp"
-                    logger.debug(f"  🔗 Normalized URL: {url}")
+                    logger.debug("  🔗 Normalized URL", url=url)
                 
                 # Create client based on protocol
                 protocol = (mcp.protocol or 'http').lower()
-                logger.debug(f"  🌐 Creating {protocol} client...")
+                logger.debug("  🌐 Creating client...", protocol=protocol)
                 
                 if protocol in ('http', 'http_streamable', 'sse'):
                     client = Client(
@@ -111,19 +119,19 @@ class MCPRegistry:
                         auth=auth,
                         timeout=mcp.timeout_seconds or 30
                     )
-                    logger.debug(f"  ✅ Client created")
+                    logger.debug("  ✅ Client created")
                 else:
                     raise ValueError(f"Unsupported protocol: {protocol}")
                 
                 # Initialize connection
-                logger.debug(f"  🔌 Initializing connection...")
+                logger.debug("  🔌 Initializing connection...")
                 await client.__aenter__()
-                logger.debug(f"  ✅ Connection established")
+                logger.debug("  ✅ Connection established")
                 
                 # Fetch tools
-                logger.debug(f"  📋 Fetching tools...")
+                logger.debug("  📋 Fetching tools...")
                 tools_result = await client.list_tools()
-                logger.debug(f"  ✅ Tools fetched")
+                logger.debug("  ✅ Tools fetched")
                 tools_list = tools_result.tools if hasattr(tools_result, 'tools') else tools_result
                 
                 # Convert to dict format
@@ -137,18 +145,18 @@ class MCPRegistry:
                 ]
                 
                 # Store in registry
-                logger.debug(f"  💾 Caching {len(tools)} tools")
+                logger.debug("  💾 Caching tools", tools=len(tools))
                 self.mcps[mcp.name] = client
                 self.tools_cache[mcp.name] = tools
                 self.client_created_at[mcp.name] = time.time()
-                logger.debug(f"  ✅ Cached in registry")
+                logger.debug("  ✅ Cached in registry")
                 
                 # Calculate response time
                 response_time_ms = int((time.time() - start_time) * 1000)
                 
                 # Update database
                 mcp.health_status = 'healthy'
-                mcp.last_health_check = datetime.utcnow()
+                mcp.last_health_check = datetime.now(timezone.utc)
                 mcp.error_count = 0
                 await db.commit()
                 
@@ -156,9 +164,9 @@ class MCPRegistry:
                 self.circuit_breaker.record_success(mcp.name)
                 
                 # Save tools to database
-                logger.debug(f"  💾 Saving tools to database...")
+                logger.debug("  💾 Saving tools to database...")
                 await self._save_tools_to_db(mcp.id, tools, db)
-                logger.debug(f"  ✅ Tools saved to database")
+                logger.debug("  ✅ Tools saved to database")
                 
                 # Log success
                 await self._log_health(
@@ -169,7 +177,7 @@ class MCPRegistry:
                 )
                 
                 logger.info(
-                    f"✅ MCP loaded successfully",
+                    "✅ MCP loaded successfully",
                     server=mcp.name,
                     tools=len(tools),
                     response_time_ms=response_time_ms,
@@ -183,8 +191,10 @@ class MCPRegistry:
                 is_connection_error = self._is_connection_error(e)
                 
                 logger.warning(
-                    f"⚠️ MCP load failed (attempt {attempt}/{max_retries})",
+                    "⚠️ MCP load failed",
                     server=mcp.name,
+                    attempt=attempt,
+                    max_retries=max_retries,
                     error=error_msg,
                     is_connection_error=is_connection_error
                 )
@@ -194,7 +204,7 @@ class MCPRegistry:
                     # Update database
                     mcp.health_status = 'error'
                     mcp.error_count = (mcp.error_count or 0) + 1
-                    mcp.last_health_check = datetime.utcnow()
+                    mcp.last_health_check = datetime.now(timezone.utc)
                     await db.commit()
                     
                     # Record failure in circuit breaker
@@ -209,8 +219,9 @@ class MCPRegistry:
                     )
                     
                     logger.error(
-                        f"❌ MCP load failed after {attempt} attempts",
+                        "❌ MCP load failed",
                         server=mcp.name,
+                        attempts=attempt,
                         error=error_msg
                     )
                     return
@@ -224,9 +235,9 @@ class MCPRegistry:
             try:
                 client = self.mcps[mcp_name]
                 await client.__aexit__(None, None, None)
-                logger.info(f"🔌 Disconnected MCP", server=mcp_name)
+                logger.info("🔌 Disconnected MCP", server=mcp_name)
             except Exception as e:
-                logger.warning(f"⚠️ Error disconnecting MCP", server=mcp_name, error=str(e))
+                logger.warning("⚠️ Error disconnecting MCP", server=mcp_name, error=str(e))
             finally:
                 del self.mcps[mcp_name]
                 self.tools_cache.pop(mcp_name, None)
@@ -247,20 +258,20 @@ class MCPRegistry:
         new_mcps = db_names - current_names
         for mcp in db_mcps:
             if mcp.name in new_mcps:
-                logger.info(f"🆕 New MCP detected", server=mcp.name)
+                logger.info("🆕 New MCP detected", server=mcp.name)
                 await self.load_mcp(mcp, db)
         
         # Unload removed MCPs
         removed_mcps = current_names - db_names
         for name in removed_mcps:
-            logger.info(f"🗑️ MCP removed", server=name)
+            logger.info("🗑️ MCP removed", server=name)
             await self.unload_mcp(name, db)
         
         # Reload changed MCPs (check updated_at)
         if self.last_check:
             for mcp in db_mcps:
                 if mcp.updated_at > self.last_check and mcp.name in current_names:
-                    logger.info(f"🔄 MCP config changed", server=mcp.name)
+                    logger.info("🔄 MCP config changed", server=mcp.name)
                     await self.unload_mcp(mcp.name, db)
                     await self.load_mcp(mcp, db)
         
@@ -271,14 +282,14 @@ class MCPRegistry:
                 age = current_time - self.client_created_at[mcp.name]
                 if age > CONNECTION_MAX_AGE_SECONDS:
                     logger.info(
-                        f"🔄 Connection too old, reconnecting",
+                        "🔄 Connection too old, reconnecting",
                         server=mcp.name,
                         age_seconds=int(age)
                     )
                     await self.unload_mcp(mcp.name, db)
                     await self.load_mcp(mcp, db)
         
-        self.last_check = datetime.utcnow()
+        self.last_check = datetime.now(timezone.utc)
     
     async def call_tool(self, mcp_name: str, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute tool on MCP."""
@@ -315,7 +326,7 @@ class MCPRegistry:
             # Record failure
             self.circuit_breaker.record_failure(mcp_name)
             
-            logger.error(f"❌ Tool call failed", server=mcp_name, tool=tool_name, error=str(e))
+            logger.error("❌ Tool call failed", server=mcp_name, tool=tool_name, error=str(e))
             return {
                 "status": "error",
                 "error": str(e),
@@ -333,42 +344,102 @@ class MCPRegistry:
             }
         
         try:
-            start_time = time.time()
-            client = self.mcps[mcp_name]
-            tools_result = await client.list_tools()
-            response_time_ms = int((time.time() - start_time) * 1000)
-            
-            tool_count = len(tools_result.tools) if hasattr(tools_result, 'tools') else 0
+            health = await self._probe(mcp_name)
             
             # Get MCP from database
             result = await db.execute(
-                select(MCPServer).where(MCPServer.name == mcp_name)
+                select(MCPServer.id).where(MCPServer.name == mcp_name)
             )
-            mcp = result.scalar_one_or_none()
+            mcp_id = result.scalar_one_or_none()
             
-            if mcp:
-                # Log health check
-                await self._log_health(
-                    db, mcp.id, 'healthy',
-                    response_time_ms=response_time_ms,
-                    event_type='health_check',
-                    metadata={'tool_count': tool_count}
-                )
+            if mcp_id is not None:
+                await self._log_probe(db, mcp_id, health)
             
-            return {
-                "healthy": True,
-                "tool_count": tool_count,
-                "response_time_ms": response_time_ms,
-                "last_check": datetime.utcnow().isoformat()
-            }
+            return health
             
         except Exception as e:
-            logger.error(f"❌ Health check failed", server=mcp_name, error=str(e))
-            return {
-                "healthy": False,
-                "error": str(e),
-                "last_check": datetime.utcnow().isoformat()
-            }
+            return self._probe_failed(mcp_name, e)
+    
+    async def health_check_all(
+        self,
+        db: AsyncSession,
+        names: Optional[List[str]] = None,
+        concurrency: int = HEALTH_CHECK_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Check health of all loaded MCPs (or just `names`).
+        
+        The list_tools probes run concurrently (at most `concurrency` at a
+        time); only the health log writes, which share the session, run one
+        after another. Results match health_check().
+        """
+        if names is None:
+            names = self.get_loaded_mcps()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def probe(name: str) -> Dict[str, Any]:
+            if name not in self.mcps:
+                return {
+                    "healthy": False,
+                    "error": f"MCP '{name}' not loaded"
+                }
+            async with semaphore:
+                return await self._probe(name)
+        
+        outcomes = await asyncio.gather(*(probe(name) for name in names), return_exceptions=True)
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                results[name] = self._probe_failed(name, outcome)
+            else:
+                results[name] = outcome
+        
+        healthy = [name for name in names if results[name]["healthy"]]
+        if healthy:
+            try:
+                rows = await db.execute(
+                    select(MCPServer.name, MCPServer.id).where(MCPServer.name.in_(healthy))
+                )
+                for name, mcp_id in rows.all():
+                    await self._log_probe(db, mcp_id, results[name])
+            except Exception as e:
+                logger.warning("Failed to record health checks", error=str(e))
+        
+        return results
+    
+    async def _probe(self, mcp_name: str) -> Dict[str, Any]:
+        """List tools on a loaded MCP (no database access). Raises on failure."""
+        start_time = time.time()
+        client = self.mcps[mcp_name]
+        tools_result = await client.list_tools()
+        response_time_ms = int((time.time() - start_time) * 1000)
+        
+        tool_count = len(tools_result.tools) if hasattr(tools_result, 'tools') else 0
+        
+        return {
+            "healthy": True,
+            "tool_count": tool_count,
+            "response_time_ms": response_time_ms,
+            "last_check": datetime.now(timezone.utc).isoformat()
+        }
+    
+    async def _log_probe(self, db: AsyncSession, mcp_id: int, health: Dict[str, Any]):
+        """Log a successful probe."""
+        await self._log_health(
+            db, mcp_id, 'healthy',
+            response_time_ms=health["response_time_ms"],
+            event_type='health_check',
+            metadata={'tool_count': health["tool_count"]}
+        )
+    
+    def _probe_failed(self, mcp_name: str, error: BaseException) -> Dict[str, Any]:
+        logger.error("❌ Health check failed", server=mcp_name, error=str(error))
+        return {
+            "healthy": False,
+            "error": str(error),
+            "last_check": datetime.now(timezone.utc).isoformat()
+        }
     
     def get_tools(self, mcp_name: Optional[str] = None) -> Dict[str, List[Dict]]:
         """Get cached tools."""
@@ -422,7 +493,7 @@ class MCPRegistry:
             
             await db.commit()
         except Exception as e:
-            logger.warning(f"Failed to save tools to database", mcp_id=mcp_id, error=str(e))
+            logger.warning("Failed to save tools to database", mcp_id=mcp_id, error=str(e))
             try:
                 await db.rollback()
             except:
@@ -451,7 +522,7 @@ class MCPRegistry:
             db.add(log)
             await db.commit()
         except Exception as e:
-            logger.warning(f"Failed to log health event", mcp_id=mcp_id, error=str(e))
+            logger.warning("Failed to log health event", mcp_id=mcp_id, error=str(e))
             try:
                 await db.rollback()
             except:
@@ -464,7 +535,7 @@ class MCPRegistry:
             try:
                 await client.__aexit__(None, None, None)
             except Exception as e:
-                logger.error(f"Error closing {name}", error=str(e))
+                logger.error("Error closing MCP", server=name, error=str(e))
         self.mcps.clear()
         self.tools_cache.clear()
         self.client_created_at.clear()
@@ -0,0 +1,70 @@
+"""
+MCP Server Repository
+
+Request-scoped access to mcp_servers rows, shared by the routers.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.database import get_db
+from app.models import MCPServer
+
+
+class MCPServerRepository:
+    """
+    Reads MCPServer rows through one request's session.
+
+    The full row list is fetched at most once per instance, and later
+    lookups in the same request are answered from it. FastAPI caches
+    dependencies per request, so every handler/dependency asking for
+    get_mcp_repo() gets the same instance.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._cache: Optional[List[MCPServer]] = None
+
+    @staticmethod
+    def _query():
+        # Only column attributes are read; fail loudly instead of lazy-loading
+        # tools/health_logs per row
+        return select(MCPServer).options(raiseload("*"))
+
+    async def list_all(self) -> List[MCPServer]:
+        """All configured MCP servers (queried once per request)."""
+        if self._cache is None:
+            result = await self.db.execute(self._query())
+            self._cache = list(result.scalars().all())
+        return self._cache
+
+    async def list_active(self) -> List[MCPServer]:
+        """MCP servers with status 'active'."""
+        return [mcp for mcp in await self.list_all() if mcp.status == 'active']
+
+    async def get_by_names(self, names: Sequence[str]) -> Dict[str, MCPServer]:
+        """
+        MCP servers by name; names with no row are left out.
+
+        Served from the row list when it is already loaded, otherwise a
+        single IN query.
+        """
+        if self._cache is not None:
+            wanted = set(names)
+            return {mcp.name: mcp for mcp in self._cache if mcp.name in wanted}
+
+        result = await self.db.execute(self._query().where(MCPServer.name.in_(names)))
+        return {mcp.name: mcp for mcp in result.scalars().all()}
+
+    async def get_by_name(self, name: str) -> Optional[MCPServer]:
+        """Single MCP server by name, or None."""
+        return (await self.get_by_names([name])).get(name)
+
+
+async def get_mcp_repo(db: AsyncSession = Depends(get_db)) -> MCPServerRepository:
+    """FastAPI dependency: one MCPServerRepository per request."""
+    return MCPServerRepository(db)
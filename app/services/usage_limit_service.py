@@ -9,12 +9,14 @@ from typing import Any, Dict
 
 from sqlalchemy import text
 
+from app import database
+
+
 class UsageLimitService:
     """Service for enforcing per-user usage limits."""
 
     def _get_engine(self):
-        from app.database import engine
-        return engine
+        return database.engine
 
     async def _ensure_user(self, conn, user_email: str) -> None:
         await conn.execute(
@@ -36,6 +38,11 @@ class UsageLimitService:
         async with engine.begin() as conn:
             await self._ensure_user(conn, user_email)
 
+            now = datetime.utcnow()
+
+            # Limit row and current-window usage in one round trip. The usage
+            # window starts at last_reset_at, or now when the window is unset
+            # or has expired (it is reset below in that case).
             result = await conn.execute(
                 text(
                     """
@@ -47,13 +54,30 @@ class UsageLimitService:
                         l.max_requests,
                         l.max_tokens,
                         l.max_cost,
-                        l.last_reset_at
+                        l.last_reset_at,
+                        usage.total_requests,
+                        usage.total_tokens,
+                        usage.total_cost
                     FROM users u
                     LEFT JOIN user_usage_limits l ON l.user_id = u.id
+                    LEFT JOIN LATERAL (
+                        SELECT
+                            COUNT(*) AS total_requests,
+                            COALESCE(SUM(a.tokens_input + a.tokens_output + a.tokens_cached), 0) AS total_tokens,
+                            COALESCE(SUM(a.cost_estimate), 0.0) AS total_cost
+                        FROM audit_logs a
+                        WHERE a.user_id = u.id
+                          AND a.created_at >= CASE
+                              WHEN l.last_reset_at IS NULL
+                                OR l.last_reset_at + make_interval(days => COALESCE(NULLIF(l.period_days, 0), 30)) <= :now
+                              THEN :now
+                              ELSE l.last_reset_at
+                          END
+                    ) usage ON l.is_active
                     WHERE u.email = :email
                     """
                 ),
-                {"email": user_email},
+                {"email": user_email, "now": now},
             )
             row = result.fetchone()
 
@@ -66,7 +90,6 @@ class UsageLimitService:
 
             period_days = row.period_days or 30
             last_reset_at = row.last_reset_at
-            now = datetime.utcnow()
 
             if last_reset_at is None:
                 last_reset_at = now
@@ -96,25 +119,9 @@ class UsageLimitService:
                     {"last_reset_at": last_reset_at, "limit_id": limit_id},
                 )
 
-            usage_result = await conn.execute(
-                text(
-                    """
-                    SELECT
-                        COUNT(*) AS total_requests,
-                        COALESCE(SUM(tokens_input + tokens_output + tokens_cached), 0) AS total_tokens,
-                        COALESCE(SUM(cost_estimate), 0.0) AS total_cost
-                    FROM audit_logs
-                    WHERE user_id = :user_id
-                      AND created_at >= :window_start
-                    """
-                ),
-                {"user_id": row.user_id, "window_start": last_reset_at},
-            )
-            usage = usage_result.fetchone()
-
-            total_requests = int(usage.total_requests or 0)
-            total_tokens = int(usage.total_tokens or 0)
-            total_cost = float(usage.total_cost or 0.0)
+            total_requests = int(row.total_requests or 0)
+            total_tokens = int(row.total_tokens or 0)
+            total_cost = float(row.total_cost or 0.0)
 
             max_requests = row.max_requests
             max_tokens = row.max_tokens
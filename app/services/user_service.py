@@ -7,7 +7,8 @@ Supports both MCP-level and tool-level permissions.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any, Union
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Union
 import time
 import fnmatch
 
@@ -21,6 +22,21 @@ from app.services.auth_client import get_user as get_user_from_auth
 from app.utils.logger import logger
 
 
+@dataclass(frozen=True, slots=True)
+class UserView:
+    """
+    A configured user as listed by UserService.list_users().
+    
+    Immutable (the list is built once and shared between callers); orjson
+    serializes it natively, same JSON as the equivalent dict.
+    """
+    email: Optional[str]
+    name: Optional[str]
+    role: Optional[str]
+    teams: Tuple[str, ...]
+    is_super_admin: bool
+
+
 class UserService:
     """Service for managing user permissions and MCP access."""
 
@@ -33,6 +49,7 @@ class UserService:
         self._permission_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self._user_cache: Dict[str, Dict[str, Any]] = {}
         self._settings_cache: Optional[Dict[str, Any]] = None
+        self._config_users: Optional[Tuple[Dict[str, Any], List[UserView]]] = None
 
     def _get_session(self) -> AsyncSession:
         if AsyncSessionLocal is None:
@@ -217,20 +234,24 @@ class UserService:
 
         return user_payload
 
-    async def list_users(self) -> List[Dict[str, Any]]:
+    async def list_users(self) -> List[UserView]:
         if AsyncSessionLocal is None:
             users_config = settings.users_config
-            combined = users_config.get("users", []) + users_config.get("super_admins", [])
-            return [
-                {
-                    "email": entry.get("email"),
-                    "name": entry.get("name"),
-                    "role": entry.get("role"),
-                    "teams": entry.get("teams", []),
-                    "is_super_admin": entry.get("is_super_admin", False),
-                }
-                for entry in combined
-            ]
+            # users.yaml is static: build the list once per loaded config object
+            cached = self._config_users
+            if cached is None or cached[0] is not users_config:
+                combined = users_config.get("users", []) + users_config.get("super_admins", [])
+                cached = self._config_users = (users_config, [
+                    UserView(
+                        email=entry.get("email"),
+                        name=entry.get("name"),
+                        role=entry.get("role"),
+                        teams=tuple(entry.get("teams", [])),
+                        is_super_admin=entry.get("is_super_admin", False),
+                    )
+                    for entry in combined
+                ])
+            return cached[1]
 
         # Get users from auth_service (simplified - just return empty for now)
         # TODO: Implement proper auth_service list_users call
@@ -248,8 +269,7 @@ class UserService:
             return cached.get("mcp_permissions", {})
         return {}
 
-    async def get_allowed_mcps(self, user_id: str) -> Union[str, List[str]]:
-        user = await self.get_user(user_id)
+    def _allowed_mcps_of(self, user: Dict[str, Any]) -> Union[str, List[str]]:
         allowed = user.get("allowed_mcps", [])
         if allowed == "*":
             return "*"
@@ -257,6 +277,15 @@ class UserService:
             return list(allowed.keys())
         return allowed if isinstance(allowed, list) else []
 
+    async def get_user_with_mcps(self, user_id: str) -> Tuple[Dict[str, Any], Union[str, List[str]]]:
+        """User record and its allowed MCPs from a single lookup."""
+        user = await self.get_user(user_id)
+        return user, self._allowed_mcps_of(user)
+
+    async def get_allowed_mcps(self, user_id: str) -> Union[str, List[str]]:
+        user = await self.get_user(user_id)
+        return self._allowed_mcps_of(user)
+
     async def can_access_mcp(self, user_id: str, mcp_name: str) -> bool:
         allowed_mcps = await self.get_allowed_mcps(user_id)
         if allowed_mcps == "*":
@@ -308,7 +337,7 @@ class UserService:
                 mode = normalized.get("mode", "inherit")
 
                 if mode == "inherit":
-                    result = self._get_role_tools(role, mcp_name, all_tools)
+                    result = await self._get_role_tools(role, mcp_name, all_tools)
                 elif mode == "custom":
                     allowed_tools = normalized.get("tools", [])
                     denied_tools = normalized.get("deny", [])
@@ -337,13 +366,11 @@ class UserService:
 
         return result
 
-    def _get_role_tools(self, role: str, mcp_name: str, all_tools: List[str]) -> List[str]:
+    async def _get_role_tools(self, role: str, mcp_name: str, all_tools: List[str]) -> List[str]:
         """Get tools allowed for a specific role from database."""
         # Try to get from database first
         if AsyncSessionLocal:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            role_tools = loop.run_until_complete(self._get_role_tools_from_db(role, mcp_name, all_tools))
+            role_tools = await self._get_role_tools_from_db(role, mcp_name, all_tools)
             if role_tools is not None:
                 return role_tools
         
@@ -5,10 +5,17 @@ Uses structlog for structured logging with JSON output in production
 and pretty console output in development.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 import structlog
 from structlog.typing import EventDict, WrappedLogger
@@ -26,26 +33,138 @@ def add_app_context(
     return event_dict
 
 
+# Substrings (matched case-insensitively) that mark a log field as sensitive.
+# Also covers DATABASE_PASSWORD, ANTHROPIC_API_KEY, SLACK_BOT_TOKEN, etc.
+_SENSITIVE_KEY_PARTS = ("password", "api_key", "secret", "token", "authorization")
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """Whether a log field name looks sensitive (memoized: field names repeat)."""
+    lowered = key.lower()
+    return any(part in lowered for part in _SENSITIVE_KEY_PARTS)
+
+
 def censor_sensitive_data(
     logger: WrappedLogger, method_name: str, event_dict: EventDict
 ) -> EventDict:
     """Censor sensitive data in logs (passwords, API keys, etc.)."""
-    sensitive_keys = {
-        "password", "api_key", "secret", "token", "authorization",
-        "DATABASE_PASSWORD", "ANTHROPIC_API_KEY", "SLACK_BOT_TOKEN"
-    }
-    
-    for key in list(event_dict.keys()):
-        if any(sensitive in key.lower() for sensitive in sensitive_keys):
+    for key in event_dict:
+        if _is_sensitive_key(key):
             event_dict[key] = "***REDACTED***"
     
     return event_dict
 
 
+class RepeatedEventFilter:
+    """
+    Drop repeated and excess INFO/DEBUG events.
+    
+    An event identical to one emitted less than `window_seconds` ago (same
+    level, message and fields) is dropped; the next copy that gets through
+    carries `repeated=<dropped count>`. If the event is forgotten first
+    (window passed, or more than `max_entries` distinct events tracked),
+    one copy is logged then with the dropped count. At most
+    `max_per_second` INFO/DEBUG events are emitted per second; the first
+    event let through after a capped burst carries
+    `rate_limited=<dropped count>`. Warnings and errors always pass.
+    
+    Applies to every event of the shared `logger` (routers and services log
+    through the same instance, so there is no narrower hook); the per-event
+    cost is one repr of the event and a short locked section.
+    
+    Must run before the timestamper, so repeats compare equal.
+    """
+    
+    def __init__(
+        self,
+        window_seconds: float = 5.0,
+        max_per_second: int = 1000,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.max_per_second = max_per_second
+        self.max_entries = max_entries
+        self._clock = clock
+        # key -> [last emit time, dropped repeats, (method, event) of a dropped copy].
+        # Re-inserted on every emit, so the oldest emits come first.
+        self._seen: "OrderedDict[str, list]" = OrderedDict()
+        self._second = 0
+        self._second_count = 0
+        self._rate_limited = 0  # Dropped by the per-second cap, not yet reported
+        self._lock = threading.Lock()
+    
+    def __call__(
+        self, logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        if method_name not in ("debug", "info"):
+            return event_dict
+        
+        key = repr(sorted(event_dict.items(), key=lambda item: item[0]))
+        now = self._clock()
+        
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.window_seconds:
+                entry[1] += 1
+                if entry[2] is None:
+                    entry[2] = (method_name, dict(event_dict))
+                raise structlog.DropEvent
+            
+            second = int(now)
+            if second != self._second:
+                self._second = second
+                self._second_count = 0
+            if self._second_count >= self.max_per_second:
+                self._rate_limited += 1
+                raise structlog.DropEvent
+            self._second_count += 1
+            if self._rate_limited:
+                event_dict["rate_limited"] = self._rate_limited
+                self._rate_limited = 0
+            
+            if entry is not None:
+                del self._seen[key]
+                if entry[1]:
+                    event_dict["repeated"] = entry[1]
+            self._seen[key] = [now, 0, None]
+            evicted = self._evict(now)
+        
+        # Outside the lock: the report goes through this filter again
+        for (evicted_method, evicted_event), dropped in evicted:
+            self._report(evicted_method, evicted_event, dropped)
+        
+        return event_dict
+    
+    def _evict(self, now: float) -> list:
+        """Forget expired events and the oldest beyond max_entries; returns unreported repeats."""
+        evicted = []
+        while self._seen:
+            emitted_at = next(iter(self._seen.values()))[0]
+            if now - emitted_at < self.window_seconds and len(self._seen) <= self.max_entries:
+                break
+            _, (_, dropped, sample) = self._seen.popitem(last=False)
+            if dropped:
+                evicted.append((sample, dropped))
+        return evicted
+    
+    def _report(self, method_name: str, event_dict: EventDict, dropped: int) -> None:
+        """Log one copy of a forgotten event with its dropped repeat count."""
+        fields = dict(event_dict)
+        event = fields.pop("event", None)
+        fields["repeated"] = dropped
+        getattr(logger, method_name)(event, **fields)
+
+
 # ============================================================
 # Logging Setup
 # ============================================================
 
+# Background thread writing queued records to the real (stream/file) handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging() -> None:
     """
     Configure structured logging for the application.
@@ -69,6 +188,7 @@ def setup_logging() -> None:
     # Build processor chain
     shared_processors = [
         structlog.contextvars.merge_contextvars,
+        RepeatedEventFilter(),
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         add_app_context,
@@ -101,11 +221,17 @@ def setup_logging() -> None:
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging
+    # Drain records queued by a previous setup call before replacing handlers
+    stop_logging()
+    
+    # Configure standard library logging. force=True replaces any handlers
+    # already on the root logger (earlier setup call, library defaults), so
+    # each record is formatted and written exactly once per sink.
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
         level=logging.getLevelName(settings.logging.level),
+        force=True,
     )
     
     # File handler for production
@@ -114,6 +240,10 @@ def setup_logging() -> None:
         file_handler.setFormatter(logging.Formatter("%(message)s"))
         logging.root.addHandler(file_handler)
     
+    # Log calls on the event loop only enqueue the record; a listener thread
+    # does the actual stdout/file writes
+    _start_queue_listener()
+    
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
@@ -121,6 +251,45 @@ def setup_logging() -> None:
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
 
 
+def _start_queue_listener() -> None:
+    """Move the root handlers behind a QueueHandler drained by a QueueListener."""
+    global _queue_listener
+    
+    handlers = list(logging.root.handlers)
+    log_queue: queue.Queue = queue.Queue(-1)
+    for handler in handlers:
+        logging.root.removeHandler(handler)
+    logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def stop_logging() -> None:
+    """
+    Flush queued log records and stop the listener thread.
+    
+    The real handlers go back on the root logger, so anything logged after
+    shutdown is still written (synchronously). Called on application
+    shutdown and at interpreter exit; safe to call more than once.
+    """
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in list(logging.root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logging.root.removeHandler(handler)
+        for handler in _queue_listener.handlers:
+            logging.root.addHandler(handler)
+        _queue_listener = None
+
+
+atexit.register(stop_logging)
+
+
 # ============================================================
 # Logger Instance
 # ============================================================
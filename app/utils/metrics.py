@@ -0,0 +1,45 @@
+"""
+Prometheus Metrics
+
+Process-wide collectors, exposed by the /metrics endpoint. Under several
+workers they are aggregated through PROMETHEUS_MULTIPROC_DIR (see
+app.routers.metrics), which must be set before this module is imported.
+"""
+
+import functools
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from prometheus_client import Counter, Histogram
+
+T = TypeVar("T")
+
+
+USERS_CACHE = Counter(
+    "users_cache_total",
+    "/users response cache lookups by result (hit, miss, stale)",
+    ["endpoint", "result"],
+)
+
+USERS_LATENCY = Histogram(
+    "users_endpoint_seconds",
+    "/users endpoint handler duration in seconds",
+    ["endpoint"],
+)
+
+
+def observe_latency(histogram: Histogram, endpoint: str):
+    """Decorator recording an async handler's duration under endpoint."""
+    child = histogram.labels(endpoint)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+
+    return decorator
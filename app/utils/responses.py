@@ -0,0 +1,23 @@
+"""
+Response Classes
+
+JSON responses rendered with orjson instead of the stdlib json encoder.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+    
+    For routes that return plain dicts/lists (no response_model or return
+    annotation). Routes with a response model are already serialized by
+    Pydantic and should keep FastAPI's default response class.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,34 @@
+-- ============================================================
+-- Audit Logs Daily Rollup
+-- ============================================================
+-- Pre-aggregated per-day audit totals used by /audit/stats.
+-- Only complete UTC days are rolled up; the current day is always read
+-- from audit_logs directly. Refreshed (CONCURRENTLY) once per day by the
+-- application's background health loop.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS audit_logs_daily_mv AS
+SELECT
+    date_trunc('day', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS day,
+    user_id,
+    status,
+    COUNT(*) AS requests,
+    COALESCE(SUM(tool_calls_count), 0) AS tool_calls,
+    COALESCE(SUM(iterations), 0) AS iterations_sum,
+    COUNT(iterations) AS iterations_n,
+    COALESCE(SUM(duration_ms), 0) AS duration_sum,
+    COUNT(duration_ms) AS duration_n,
+    COALESCE(SUM(cost_estimate), 0) AS cost
+FROM audit_logs
+WHERE created_at < date_trunc('day', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+GROUP BY 1, 2, 3
+WITH DATA;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS uq_audit_logs_daily_mv
+    ON audit_logs_daily_mv(day, user_id, status);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_daily_mv_user_day
+    ON audit_logs_daily_mv(user_id, day);
+
+COMMENT ON MATERIALIZED VIEW audit_logs_daily_mv IS 'Daily audit_logs aggregates per user/status (complete UTC days only).';
+COMMENT ON COLUMN audit_logs_daily_mv.day IS 'UTC day (midnight) the requests were logged on.';
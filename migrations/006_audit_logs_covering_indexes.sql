@@ -0,0 +1,32 @@
+-- ============================================================
+-- Audit Logs Covering Indexes
+-- ============================================================
+-- Composite/partial indexes matching the audit query predicates:
+-- - get_logs(status='error') ordered by created_at DESC
+-- - per-user reads (get_logs, get_stats, usage limit window totals)
+-- - the raw (today) part of /audit/stats, scanned by created_at only
+-- INCLUDE columns cover every column the stats and usage-limit
+-- aggregates read, so those can be answered from the index alone.
+--
+-- The (user_id, created_at) and (created_at) indexes supersede
+-- idx_audit_logs_user_id and idx_audit_logs_created_at from init.sql,
+-- which are dropped so inserts do not maintain redundant btrees.
+-- idx_audit_logs_user_created_at (an earlier version of this migration,
+-- without iterations/tool_calls_count) is replaced the same way.
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_errors_created_at
+    ON audit_logs(created_at DESC)
+    WHERE status = 'error';
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_created_at_stats
+    ON audit_logs(user_id, created_at DESC)
+    INCLUDE (status, iterations, tool_calls_count, duration_ms, cost_estimate,
+             tokens_input, tokens_output, tokens_cached);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at_stats
+    ON audit_logs(created_at DESC)
+    INCLUDE (status, iterations, tool_calls_count, duration_ms, cost_estimate);
+
+DROP INDEX IF EXISTS idx_audit_logs_user_created_at;
+DROP INDEX IF EXISTS idx_audit_logs_user_id;
+DROP INDEX IF EXISTS idx_audit_logs_created_at;
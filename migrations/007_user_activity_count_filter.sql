@@ -0,0 +1,21 @@
+-- ============================================================
+-- User Activity View: COUNT FILTER
+-- ============================================================
+-- Success/failure counts use COUNT(*) FILTER instead of
+-- SUM(CASE ... THEN 1 ELSE 0 END). Same results (bigint, 0 for users
+-- without activity); matches init.sql for existing databases.
+
+CREATE OR REPLACE VIEW v_user_activity AS
+SELECT 
+    u.id,
+    u.email,
+    u.name,
+    u.role,
+    COUNT(al.id) as total_queries,
+    COUNT(*) FILTER (WHERE al.success) as successful_queries,
+    COUNT(*) FILTER (WHERE NOT al.success) as failed_queries,
+    AVG(al.duration_ms) as avg_duration_ms,
+    MAX(al.timestamp) as last_activity
+FROM users u
+LEFT JOIN audit_logs al ON u.id = al.user_id
+GROUP BY u.id, u.email, u.name, u.role;
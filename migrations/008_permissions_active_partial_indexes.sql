@@ -0,0 +1,29 @@
+-- ============================================================
+-- Permission Tables: Active-Row Partial Indexes
+-- ============================================================
+-- The admin permission listings only read active rows
+-- (list_role_permissions, get_role_permissions, list_team_roles).
+-- Partial indexes over is_active rows with the listed columns INCLUDEd
+-- let those reads run as index-only scans and skip soft-deleted rows.
+-- Also declared on the models for databases created from metadata.
+--
+-- role_permissions and team_roles are not created by these migrations
+-- (only by the models), so each index is skipped if its table is missing.
+
+DO $$
+BEGIN
+    IF to_regclass('role_permissions') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_role_permissions_active
+            ON role_permissions(role_name, mcp_name)
+            INCLUDE (id, mode, allowed_tools, denied_tools, description)
+            WHERE is_active;
+    END IF;
+    
+    IF to_regclass('team_roles') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_team_roles_active
+            ON team_roles(team_name)
+            INCLUDE (id, default_role, description)
+            WHERE is_active;
+    END IF;
+END
+$$;
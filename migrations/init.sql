@@ -526,8 +526,8 @@ SELECT
     u.name,
     u.role,
     COUNT(al.id) as total_queries,
-    SUM(CASE WHEN al.success THEN 1 ELSE 0 END) as successful_queries,
-    SUM(CASE WHEN NOT al.success THEN 1 ELSE 0 END) as failed_queries,
+    COUNT(*) FILTER (WHERE al.success) as successful_queries,
+    COUNT(*) FILTER (WHERE NOT al.success) as failed_queries,
     AVG(al.duration_ms) as avg_duration_ms,
     MAX(al.timestamp) as last_activity
 FROM users u
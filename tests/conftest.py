@@ -0,0 +1,18 @@
+"""
+Shared Test Setup
+
+Makes the app package importable and provides the settings app.config
+requires at import time, before any test module is collected.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Required settings for app.config
+os.environ.setdefault("DATABASE_PASSWORD", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
@@ -0,0 +1,168 @@
+"""
+Test /users Response Caching and Stale Fallback
+
+Run with: python -m pytest tests/test_api_users.py -v
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from app.routers import users
+from app.services import cache_invalidation
+from app.services.user_service import UserView, get_user_service
+
+
+class FakeUserService:
+    """User service that counts lookups and can be switched to failing."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def get_user(self, user_id):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("backend down")
+        return {"name": "Alice", "role": "dba"}
+
+    async def get_user_with_mcps(self, user_id):
+        return await self.get_user(user_id), ["oracle"]
+
+    async def list_users(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [UserView("alice@example.com", "Alice", "admin", ("dba",), True)]
+
+
+@pytest.fixture
+def service():
+    fake = FakeUserService()
+    app = FastAPI()
+    app.include_router(users.router)
+    app.dependency_overrides[get_user_service] = lambda: fake
+    fake.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    users.invalidate_users_cache()
+    yield fake
+    users.invalidate_users_cache()
+
+
+async def test_user_info_is_cached(service):
+    first = await service.client.get("/users/alice@example.com")
+    second = await service.client.get("/users/alice@example.com")
+
+    assert first.json() == second.json()
+    assert first.json()["role"] == "dba"
+    assert service.calls == 1
+
+
+async def test_expired_entry_served_stale_on_failure(service, monkeypatch):
+    await service.client.get("/users")
+    users._users_list_cache["timestamp"] -= users.USERS_CACHE_TTL + 1
+    service.fail = True
+
+    response = await service.client.get("/users")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "STALE"
+    assert response.json()["super_admins"] == 1
+
+    monkeypatch.setattr(users.settings.app, "cache_fallback_enabled", False)
+    assert (await service.client.get("/users")).status_code == 500
+
+
+async def test_user_cache_is_bounded(service, monkeypatch):
+    monkeypatch.setattr(users, "USERS_CACHE_MAX_ENTRIES", 2)
+    for name in ("a", "b", "c"):
+        await service.client.get(f"/users/{name}@example.com")
+    assert list(users._user_info_cache) == ["b@example.com", "c@example.com"]
+
+    users._user_info_cache["b@example.com"]["timestamp"] -= users.USERS_STALE_TTL + 1
+    await service.client.get("/users/d@example.com")
+    assert list(users._user_info_cache) == ["c@example.com", "d@example.com"]
+
+
+async def test_cache_notification_clears_cache(service):
+    await service.client.get("/users/alice@example.com")
+
+    cache_invalidation._on_notification(None, 0, cache_invalidation.CACHE_INVALIDATION_CHANNEL, "")
+    await service.client.get("/users/alice@example.com")
+    assert service.calls == 2
+
+
+async def test_failure_without_cache_is_500(service):
+    service.fail = True
+    response = await service.client.get("/users/bob@example.com")
+    assert response.status_code == 500
+
+
+async def test_matching_etag_gets_304(service):
+    first = await service.client.get("/users/alice@example.com")
+    etag = first.headers["ETag"]
+
+    response = await service.client.get("/users/alice@example.com", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+    other = await service.client.get("/users/alice@example.com", headers={"If-None-Match": '"other"'})
+    assert other.status_code == 200
+
+
+async def test_batch_resolves_each_user_once(service):
+    await service.client.get("/users/alice@example.com")
+
+    response = await service.client.post(
+        "/users:batch",
+        json={"emails": ["alice@example.com", "bob@example.com", "alice@example.com"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data) == ["alice@example.com", "bob@example.com"]
+    assert data["bob@example.com"]["email"] == "bob@example.com"
+    assert service.calls == 2
+
+    again = await service.client.post(
+        "/users:batch",
+        json={"emails": ["alice@example.com", "bob@example.com"]},
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert again.status_code == 304
+
+
+async def test_email_case_variants_share_one_entry(service):
+    first = await service.client.get("/users/Alice@Example.com")
+    second = await service.client.get("/users/alice@example.com")
+
+    assert first.json()["email"] == "alice@example.com"
+    assert first.content == second.content
+    assert service.calls == 1
+
+
+async def test_cache_results_are_counted(service):
+    def count(result):
+        return REGISTRY.get_sample_value(
+            "users_cache_total", {"endpoint": "user_info", "result": result}
+        ) or 0
+
+    hits, misses = count("hit"), count("miss")
+    await service.client.get("/users/alice@example.com")
+    await service.client.get("/users/alice@example.com")
+
+    assert count("miss") == misses + 1
+    assert count("hit") == hits + 1
+
+
+async def test_warm_users_cache_primes_configured_users(service, monkeypatch):
+    monkeypatch.setattr(users.settings, "users_config", {
+        "super_admins": [{"email": "Alice@example.com"}],
+        "users": [{"email": "bob@example.com"}, {"email": "alice@example.com"}],
+    })
+
+    assert await users.warm_users_cache(service) == 2
+    assert service.calls == 2
+
+    await service.client.get("/users/bob@example.com")
+    assert service.calls == 2
@@ -0,0 +1,211 @@
+"""
+Test Audit Service Stats Caching
+
+Run with: python -m pytest tests/test_audit_service.py -v
+"""
+
+from unittest.mock import MagicMock
+
+from app import database
+from app.services.audit_service import AuditService
+
+
+class FakeConnection:
+    """Async connection returning a single canned stats row."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.engine.calls += 1
+        row = MagicMock()
+        row._mapping = {"total_requests": self.engine.calls, "total_cost": 0.5}
+        result = MagicMock()
+        result.fetchone.return_value = row
+        return result
+
+
+class FakeEngine:
+    """Counts how many queries reach the database."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def begin(self):
+        return FakeConnection(self)
+
+
+async def test_stats_served_from_cache_within_ttl(monkeypatch):
+    """Repeated stats requests for the same window hit the database once."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    first = await service.get_stats(user_id="a@x.com", days=7)
+    second = await service.get_stats(user_id="a@x.com", days=7)
+
+    assert engine.calls == 1
+    assert first == second == {"total_requests": 1, "total_cost": 0.5}
+
+    # Callers get their own copy
+    second["total_requests"] = 99
+    assert (await service.get_stats(user_id="a@x.com", days=7))["total_requests"] == 1
+
+
+async def test_stats_cache_keyed_by_user_and_window(monkeypatch):
+    """Different users or windows are queried separately."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    await service.get_stats(user_id="a@x.com", days=7)
+    await service.get_stats(user_id="a@x.com", days=30)
+    await service.get_stats(user_id="b@x.com", days=7)
+
+    assert engine.calls == 3
+
+
+async def test_stats_cache_expires(monkeypatch):
+    """Entries older than the TTL are refreshed."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    await service.get_stats(days=7)
+    entry = service._stats_cache[(None, 7)]
+    entry["timestamp"] -= service.STATS_CACHE_TTL + 1
+
+    stats = await service.get_stats(days=7)
+
+    assert engine.calls == 2
+    assert stats["total_requests"] == 2
+
+
+async def test_stats_cache_metrics_and_clear(monkeypatch):
+    """Hits and misses are counted; clearing forces a fresh query."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    await service.get_stats(days=7)
+    await service.get_stats(days=7)
+
+    metrics = service.get_stats_cache_stats()
+    assert (metrics["hits"], metrics["misses"], metrics["valid"]) == (1, 1, 1)
+
+    assert service.clear_stats_cache() == 1
+    await service.get_stats(days=7)
+    assert engine.calls == 2
+
+
+async def test_get_logs_rejects_unknown_status_without_query(monkeypatch):
+    """An unknown status filter matches nothing and never reaches the database."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    assert await service.get_logs(status="bogus") == []
+    assert engine.calls == 0
+
+
+class UndefinedTableError(Exception):
+    """Stands in for asyncpg's UndefinedTableError."""
+
+    sqlstate = "42P01"
+
+
+class RollupConnection(FakeConnection):
+    """Connection delegating every statement to its RollupEngine."""
+
+    async def execute(self, statement, params=None):
+        return await self.engine.run(statement)
+
+
+class RollupEngine:
+    """Answers the rollup refresh queries: advisory lock, then freshness check."""
+
+    def __init__(self, locked=True, current=False, fail=False, missing=False):
+        self.locked = locked
+        self.current = current
+        self.fail = fail
+        self.missing = missing
+        self.statements = []
+
+    def begin(self):
+        return RollupConnection(self)
+
+    async def run(self, statement):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "audit_logs_daily_mv" in sql and "advisory" not in sql and self.missing:
+            # SQLAlchemy's wrapper -> driver adapter error -> asyncpg error
+            error = RuntimeError("(ProgrammingError) <class 'UndefinedTableError'>")
+            error.orig = RuntimeError("driver error")
+            error.orig.__cause__ = UndefinedTableError("relation missing")
+            raise error
+        if sql.startswith("REFRESH") and self.fail:
+            raise RuntimeError("canceling statement due to statement timeout")
+        result = MagicMock()
+        result.scalar.return_value = self.locked if "advisory" in sql else self.current
+        return result
+
+
+def refreshed(engine):
+    """Whether engine ran the REFRESH statement."""
+    return any(sql.startswith("REFRESH") for sql in engine.statements)
+
+
+async def test_rollup_refresh_skipped_when_locked_or_current(monkeypatch):
+    """Only the process holding the advisory lock refreshes a stale view."""
+    service = AuditService()
+
+    for engine in (RollupEngine(locked=False), RollupEngine(current=True)):
+        monkeypatch.setattr(database, "engine", engine)
+        assert await service.refresh_daily_rollup() is True
+        assert not refreshed(engine)
+
+    engine = RollupEngine()
+    monkeypatch.setattr(database, "engine", engine)
+    assert await service.refresh_daily_rollup() is True
+    assert refreshed(engine)
+
+
+async def test_rollup_refresh_backs_off_after_failure(monkeypatch):
+    """A failed refresh is not retried before DAILY_ROLLUP_RETRY_SECONDS."""
+    engine = RollupEngine(fail=True)
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    assert await service.refresh_daily_rollup() is False
+    attempts = len(engine.statements)
+    assert await service.refresh_daily_rollup() is False
+    assert len(engine.statements) == attempts
+
+    service._daily_rollup_retry_at = 0.0
+    engine.fail = False
+    assert await service.refresh_daily_rollup() is True
+
+
+
+async def test_missing_rollup_detected_by_sqlstate_and_reprobed(monkeypatch):
+    """A missing view disables the rollup until a later refresh finds it."""
+    engine = RollupEngine(missing=True)
+    monkeypatch.setattr(database, "engine", engine)
+    service = AuditService()
+
+    assert await service.refresh_daily_rollup() is False
+    assert service._daily_rollup_available is False
+
+    service._daily_rollup_retry_at = 0.0
+    engine.missing = False
+    assert await service.refresh_daily_rollup() is True
+    assert service._daily_rollup_available is True
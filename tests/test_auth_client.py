@@ -0,0 +1,54 @@
+"""
+Test Auth Client Negative Caching
+
+Run with: python -m pytest tests/test_auth_client.py -v
+"""
+
+import httpx
+import pytest
+
+from app.services import auth_client
+
+
+@pytest.fixture
+def auth_service(monkeypatch):
+    """Fake auth_service that knows no users; counts requests."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(404, json={"detail": "not found"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        auth_client.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    auth_client.clear_all_cache()
+    yield requests
+    auth_client.clear_all_cache()
+
+
+async def test_unknown_email_is_negatively_cached(auth_service):
+    assert await auth_client.get_user_by_email("typo@example.com") is None
+    assert await auth_client.get_user_by_email("typo@example.com") is None
+    assert len(auth_service) == 1
+
+    assert await auth_client.get_user_by_email("typo@example.com", bypass_cache=True) is None
+    assert len(auth_service) == 2
+
+
+async def test_invalidate_drops_negative_entry(auth_service):
+    await auth_client.get_user(42)
+    auth_client.invalidate_user_cache(user_id=42)
+    await auth_client.get_user(42)
+    assert len(auth_service) == 2
+
+
+async def test_negative_cache_is_bounded(auth_service, monkeypatch):
+    monkeypatch.setattr(auth_client, "NEGATIVE_CACHE_MAX_ENTRIES", 2)
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        await auth_client.get_user_by_email(email)
+
+    assert list(auth_client._missing_cache) == ["b@example.com", "c@example.com"]
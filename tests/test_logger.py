@@ -0,0 +1,74 @@
+"""
+Test Repeated Log Event Filtering
+
+Run with: python -m pytest tests/test_logger.py -v
+"""
+
+import structlog
+
+from app.utils.logger import RepeatedEventFilter
+
+
+def emit(log_filter, method_name="info", **event_dict):
+    """Run one event through the filter; None if it was dropped."""
+    try:
+        return log_filter(None, method_name, dict(event_dict))
+    except structlog.DropEvent:
+        return None
+
+
+def test_repeats_dropped_within_window():
+    clock = [100.0]
+    log_filter = RepeatedEventFilter(window_seconds=5.0, clock=lambda: clock[0])
+
+    assert emit(log_filter, event="Invalidated permission cache", user="1") is not None
+    assert emit(log_filter, event="Invalidated permission cache", user="1") is None
+    assert emit(log_filter, event="Invalidated permission cache", user="1") is None
+    # Different fields are a different event
+    assert emit(log_filter, event="Invalidated permission cache", user="2") is not None
+
+    clock[0] += 5.0
+    passed = emit(log_filter, event="Invalidated permission cache", user="1")
+    assert passed["repeated"] == 2
+
+
+def test_warnings_and_errors_never_dropped():
+    log_filter = RepeatedEventFilter()
+
+    for _ in range(3):
+        assert emit(log_filter, "error", event="Health check loop error") is not None
+        assert emit(log_filter, "warning", event="Health check loop error") is not None
+
+
+def test_rate_cap_per_second():
+    clock = [100.0]
+    log_filter = RepeatedEventFilter(max_per_second=3, clock=lambda: clock[0])
+
+    results = [emit(log_filter, event="HTTP Request", n=n) for n in range(5)]
+    assert sum(result is not None for result in results) == 3
+
+    clock[0] += 1.0
+    passed = emit(log_filter, event="HTTP Request", n=99)
+    assert passed["rate_limited"] == 2
+    assert "rate_limited" not in emit(log_filter, event="HTTP Request", n=100)
+
+
+def test_forgotten_repeats_are_reported(monkeypatch):
+    clock = [100.0]
+    log_filter = RepeatedEventFilter(window_seconds=5.0, max_entries=2, clock=lambda: clock[0])
+    reports = []
+    monkeypatch.setattr(log_filter, "_report", lambda *args: reports.append(args))
+
+    emit(log_filter, event="Cache hit", key="a")
+    assert emit(log_filter, event="Cache hit", key="a") is None
+    emit(log_filter, event="Cache hit", key="b")
+    # Over max_entries: the oldest event is forgotten and its repeat reported
+    emit(log_filter, event="Cache hit", key="c")
+    assert reports == [("info", {"event": "Cache hit", "key": "a"}, 1)]
+    assert len(log_filter._seen) == 2
+
+    # Past the window every tracked event is forgotten
+    clock[0] += 5.0
+    emit(log_filter, event="Cache hit", key="d")
+    assert next(iter(log_filter._seen.values()))[0] == clock[0]
+    assert len(log_filter._seen) == 1
@@ -0,0 +1,50 @@
+"""
+Test MCP Server Repository Memoization
+
+Run with: python -m pytest tests/test_mcp_repository.py -v
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.services.mcp_repository import MCPServerRepository
+
+
+ROWS = [
+    SimpleNamespace(name="oracle", status="active"),
+    SimpleNamespace(name="postgres", status="active"),
+    SimpleNamespace(name="legacy", status="inactive"),
+]
+
+
+class FakeSession:
+    """Async session returning the canned rows and counting queries."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, statement):
+        self.calls += 1
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ROWS
+        return result
+
+
+async def test_list_all_queries_once_per_repository():
+    db = FakeSession()
+    repo = MCPServerRepository(db)
+
+    assert [mcp.name for mcp in await repo.list_all()] == ["oracle", "postgres", "legacy"]
+    assert [mcp.name for mcp in await repo.list_active()] == ["oracle", "postgres"]
+    assert db.calls == 1
+
+
+async def test_lookups_reuse_loaded_rows():
+    db = FakeSession()
+    repo = MCPServerRepository(db)
+    await repo.list_all()
+
+    assert set(await repo.get_by_names(["oracle", "missing"])) == {"oracle"}
+    assert (await repo.get_by_name("legacy")).status == "inactive"
+    assert await repo.get_by_name("missing") is None
+    assert db.calls == 1
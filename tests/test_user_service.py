@@ -0,0 +1,38 @@
+"""
+Test User Service Role Tool Resolution
+
+Run with: python -m pytest tests/test_user_service.py -v
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.services import user_service
+
+
+class FakeSession:
+    """Async session returning a single role permission row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = self.row
+        return result
+
+
+async def test_role_tools_resolved_from_db_inside_running_loop(monkeypatch):
+    row = SimpleNamespace(mode="custom", allowed_tools=["get_*"], denied_tools=["get_secret"])
+    monkeypatch.setattr(user_service, "AsyncSessionLocal", lambda: FakeSession(row))
+
+    tools = await user_service.UserService()._get_role_tools(
+        "dba", "oracle", ["get_status", "get_secret", "drop_table"]
+    )
+    assert tools == ["get_status"]